@@ -1,16 +1,23 @@
-
+import os, sys
 import streamlit as st
 
+ROOT = os.path.dirname(os.path.abspath(__file__))
+if ROOT not in sys.path: sys.path.insert(0, ROOT)
+from mathgames.games import GAMES
+from mathgames import warmup
+
 st.set_page_config(page_title="Math Games Hub", page_icon="🎮", layout="centered")
+warmup.start()   # first run after a (re)start: fonts, pandas and the common images load in the background
 
 st.title("🎮 Math Games Hub")
 st.write("Welcome! Choose a game below, or use the sidebar.")
 
 try:
-    # Streamlit 1.30+ only
-    st.page_link("pages/01_Slope_Showdown.py", label="📈 Slope Showdown — Identify Positive/Negative/Zero/Undefined", icon="➡️")
+    # st.page_link raises if a page file is missing (e.g. app.py copied without pages/)
+    for game in GAMES.values():
+        st.page_link(game.page, label=f"{game.icon} {game.title} — {game.blurb}", icon="➡️")
 except Exception:
-    st.info("Use the left sidebar to open: 📈 Slope Showdown")
+    st.info("Use the left sidebar to open: " + ", ".join(f"{g.icon} {g.title}" for g in GAMES.values()))
 
 st.divider()
 st.caption("Tip: Each game has a Results page where you can download progress CSVs.")
@@ -0,0 +1,202 @@
+# Classroom load test: N simulated students hit a game (--game, default Slope Showdown) at the same bell.
+# Each student signs in, starts a game (reset_game), views + answers questions and logs them,
+# all in parallel (threads in direct mode; one process per student in apptest mode, since AppTest
+# keeps a process-global runtime). Reports p50/p95/p99 per action, graph renders/sec, log write
+# throughput and peak RSS, and writes everything to a JSON file for comparing versions.
+#
+# Run from the repo root:
+#   python bench/classroom_load.py --students 60 --storage sqlite --out bench_results.json
+#   python bench/classroom_load.py --mode apptest --students 10          # full Streamlit script via AppTest
+#                                    (plays the page's own game length; --questions/--min-score are direct-only)
+#   python bench/classroom_load.py --game two_point_slope --students 60
+#   python bench/classroom_load.py --compare old.json --out new.json      # print p95 deltas vs an earlier run
+
+import argparse, json, os, random, resource, subprocess, sys, tempfile, threading, time, uuid
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ACTIONS = ["sign_in", "reset_game", "view", "answer", "log", "summary"]
+
+def percentiles(xs):
+    if not xs: return {"n": 0}
+    xs = sorted(xs); pick = lambda q: xs[min(len(xs)-1, int(q * len(xs)))]
+    return {"n": len(xs), "p50_ms": round(pick(.50)*1000, 3), "p95_ms": round(pick(.95)*1000, 3),
+            "p99_ms": round(pick(.99)*1000, 3), "max_ms": round(xs[-1]*1000, 3)}
+
+class Timer:
+    def __init__(self):
+        self.samples = {a: [] for a in ACTIONS}
+        self._lock = threading.Lock()
+
+    def time(self, action, fn, *args, **kw):
+        t0 = time.perf_counter(); out = fn(*args, **kw); dt = time.perf_counter() - t0
+        with self._lock: self.samples[action].append(dt)
+        return out
+
+# ---------------- Direct mode: game logic without a browser ----------------
+def play_direct(timer, rng, args):
+    from mathgames.engine import GameEngine, log_progress, log_summary
+    engine = GameEngine(num_questions=args.questions, min_score=args.min_score, backend=args.backend,
+                        log_progress=lambda *row, **kw: timer.time("log", log_progress, *row, **kw),
+                        log_summary=lambda *row, **kw: timer.time("summary", log_summary, *row, **kw),
+                        game=args.game)
+    sid = timer.time("sign_in", lambda: uuid.uuid4().hex[:12])
+    g = timer.time("reset_game", engine.new_game, f"Student {sid[:4]}", str(rng.randint(1, 9)), sid)
+    while g.index < g.total and not g.auto_finished:
+        q = engine.current(g)
+        timer.time("view", lambda: q.image)                 # graph lookup/render, as the page does on display
+        choice = q.answer if rng.random() < args.accuracy else rng.choice(q.choices)
+        timer.time("answer", engine.submit, g, choice)      # includes the log_progress timing above
+        if args.think: time.sleep(rng.uniform(0, args.think))
+        if not g.auto_finished: engine.next(g)
+    engine.finish(g)
+
+# ---------------- AppTest mode: the real page script, headless ----------------
+def play_apptest(timer, rng, args):
+    from streamlit.testing.v1 import AppTest
+    from mathgames.games import get_game
+    page = os.path.join(ROOT, get_game(args.game).page)
+    at = timer.time("reset_game", lambda: AppTest.from_file(page, default_timeout=120).run())
+    at.sidebar.radio(key="nav").set_value("Play").run()
+    at.text_input[0].input(f"Student {rng.randrange(10**6)}")
+    timer.time("sign_in", lambda: at.button[0].click().run())
+    while True:         # the page's own engine decides the length: play until it ends the game
+        state = at.session_state[args.game]; g = state.game
+        if state.stage != "game" or g.auto_finished or g.index >= g.total: break
+        i = g.index; q = g.questions[i]
+        choice = q.answer if rng.random() < args.accuracy else rng.choice(q.choices)
+        timer.time("view", lambda: at.radio(key=f"radio_{i}").set_value(choice).run())
+        timer.time("answer", lambda: [b for b in at.button if b.label == "Submit"][0].click().run())
+        nxt = [b for b in at.button if b.label.startswith("Next")]
+        if not nxt: break
+        if args.think: time.sleep(rng.uniform(0, args.think))
+        timer.time("view", lambda: nxt[0].click().run())
+    if at.exception: raise RuntimeError(at.exception)
+
+# ---------------- Runner ----------------
+def git_version():
+    try:
+        return subprocess.run(["git", "-C", ROOT, "describe", "--always", "--dirty"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return None
+
+def run(args):
+    # Environment first: the mathgames modules read their settings at import time.
+    os.environ["SLOPE_STORAGE"] = args.storage
+    os.environ["SLOPE_GRAPH_BACKEND"] = args.backend
+    if args.cold: os.environ["SLOPE_GRAPH_CACHE_DIR"] = ""
+    workdir = args.workdir or tempfile.mkdtemp(prefix="slope_bench_")
+    os.makedirs(workdir, exist_ok=True); os.chdir(workdir)
+    sys.path.insert(0, ROOT)
+    from mathgames.engine import NUM_QUESTIONS, MIN_SCORE_TO_WIN
+    from mathgames.graphs import GRAPHS
+    from mathgames.logwriter import LOG_WRITER
+    if args.questions is None: args.questions = NUM_QUESTIONS        # recorded in the config as played
+    if args.min_score is None: args.min_score = MIN_SCORE_TO_WIN
+
+    if args.mode == "apptest":
+        timer, errors, graphs, writer, t0 = run_processes(args)
+    else:
+        timer, errors, t0 = run_threads(args)
+        flush_t0 = time.perf_counter(); LOG_WRITER.flush(timeout=60)
+        graphs, writer = GRAPHS.stats(), {**LOG_WRITER.stats(), "drain_s": round(time.perf_counter() - flush_t0, 3)}
+    wall = time.perf_counter() - t0
+    flush_s = writer["avg_flush_ms"] * writer["flushes"] / 1000
+    rss_kib = max(resource.getrusage(r).ru_maxrss for r in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN))
+    return {
+        "version": git_version(), "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "config": {k: v for k, v in vars(args).items() if k not in ("out", "compare")}, "workdir": workdir,
+        "wall_s": round(wall, 3), "errors": errors,
+        "actions": {a: percentiles(xs) for a, xs in timer.samples.items()},
+        "graphs": {**graphs, "renders_per_s": round(graphs["renders"] / wall, 2),
+                   "questions_per_s": round(len(timer.samples["view"]) / wall, 2)},
+        "writes": {**writer, "rows_per_s": round(writer["rows_written"] / wall, 2),
+                   "rows_per_flush_s": round(writer["rows_written"] / flush_s, 1) if flush_s else None},
+        "peak_rss_mb": round(rss_kib / 1024, 1),        # ru_maxrss is KiB on Linux; largest single process
+    }
+
+def student(n, args, timer, errors):
+    rng = random.Random(args.seed * 100003 + n)
+    play = play_apptest if args.mode == "apptest" else play_direct
+    try:
+        for _ in range(args.games): play(timer, rng, args)
+    except Exception as e:
+        errors.append(f"student {n}: {e!r}")
+
+def run_threads(args):
+    timer, errors = Timer(), []
+    bell = threading.Barrier(args.students + 1)        # everyone starts at the same bell
+    def go(n):
+        bell.wait(); student(n, args, timer, errors)
+    threads = [threading.Thread(target=go, args=(n,)) for n in range(args.students)]
+    for t in threads: t.start()
+    bell.wait(); t0 = time.perf_counter()
+    for t in threads: t.join()
+    return timer, errors, t0
+
+def _process_student(n, args, start_at):
+    from mathgames.graphs import GRAPHS
+    from mathgames.logwriter import LOG_WRITER
+    timer, errors = Timer(), []
+    time.sleep(max(0.0, start_at - time.time()))
+    student(n, args, timer, errors)
+    LOG_WRITER.flush(timeout=60)
+    return timer.samples, errors, GRAPHS.stats(), LOG_WRITER.stats()
+
+def run_processes(args):
+    import multiprocessing as mp
+    from concurrent.futures import ProcessPoolExecutor
+    timer, errors, graphs, writer = Timer(), [], {}, {}
+    start_at = time.time() + 3.0                        # give every worker time to spawn and import
+    with ProcessPoolExecutor(args.students, mp_context=mp.get_context("fork")) as pool:
+        futures = [pool.submit(_process_student, n, args, start_at) for n in range(args.students)]
+        t0 = time.perf_counter() + max(0.0, start_at - time.time())
+        for f in futures:
+            samples, errs, g, w = f.result()
+            for a, xs in samples.items(): timer.samples[a].extend(xs)
+            errors.extend(errs)
+            for k, v in g.items(): graphs[k] = graphs.get(k, 0) + v
+            for k, v in w.items(): writer[k] = max(writer.get(k, 0), v) if k.endswith("_ms") else writer.get(k, 0) + v
+    return timer, errors, graphs, writer, t0
+
+def compare(old, new):
+    for a in ACTIONS:
+        o, n = old["actions"].get(a, {}), new["actions"].get(a, {})
+        if o.get("n") and n.get("n"):
+            print(f"{a:>10}  p95 {o['p95_ms']:>9.3f} -> {n['p95_ms']:>9.3f} ms  ({(n['p95_ms'] - o['p95_ms']) / (o['p95_ms'] or 1):+.0%})")
+    print(f"{'rss':>10}  {old['peak_rss_mb']} -> {new['peak_rss_mb']} MB")
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Math games classroom load test")
+    ap.add_argument("--game", default="slope_showdown", help="registered game id (python -m mathgames.games lists them)")
+    ap.add_argument("--students", type=int, default=30)
+    ap.add_argument("--games", type=int, default=1, help="games per student")
+    ap.add_argument("--questions", type=int, help="questions per game (default: NUM_QUESTIONS; direct mode only)")
+    ap.add_argument("--min-score", type=int, help="auto-finish threshold (default: MIN_SCORE_TO_WIN; direct mode only)")
+    ap.add_argument("--accuracy", type=float, default=0.7, help="chance a simulated student answers correctly")
+    ap.add_argument("--think", type=float, default=0.0, help="max random think time between questions (s)")
+    ap.add_argument("--mode", choices=["direct", "apptest"], default="direct")
+    ap.add_argument("--storage", choices=["csv", "sqlite"], default="csv")
+    ap.add_argument("--backend", choices=["svg", "canvas", "png"], default="svg")
+    ap.add_argument("--cold", action="store_true", help="no disk graph cache (every image rendered in-process)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--workdir", help="where the logs go (default: a fresh temp dir)")
+    ap.add_argument("--out", default="bench_results.json")
+    ap.add_argument("--compare", help="earlier results JSON to diff against")
+    args = ap.parse_args(argv)
+    if args.mode == "apptest" and (args.questions is not None or args.min_score is not None):
+        ap.error("--questions and --min-score only apply to --mode direct; the page plays its engine's defaults")
+    out = os.path.abspath(args.out); old = os.path.abspath(args.compare) if args.compare else None
+    result = run(args)
+    with open(out, "w", encoding="utf-8") as f: json.dump(result, f, indent=2)
+    for a, p in result["actions"].items():
+        if p["n"]: print(f"{a:>10}  n={p['n']:<6} p50={p['p50_ms']:.3f}ms  p95={p['p95_ms']:.3f}ms  p99={p['p99_ms']:.3f}ms")
+    print(f"wall {result['wall_s']}s | renders/s {result['graphs']['renders_per_s']} | "
+          f"rows/s {result['writes']['rows_per_s']} | peak RSS {result['peak_rss_mb']} MB | errors {len(result['errors'])}")
+    if old:
+        with open(old, encoding="utf-8") as f: compare(json.load(f), result)
+    print(f"wrote {out}")
+    return 1 if result["errors"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+# Cold start: what the first student after a deploy or restart waits for.
+# Every run is a fresh Python process (nothing imported or cached yet) working in an empty
+# directory with an empty graph cache; --fresh-fonts also starts Matplotlib without a font cache,
+# as on a new container. Per run it measures
+#   import    importing the game page's modules, and which heavy libraries that pulls in
+#   hub       the hub's (app.py) first run; the student then spends --delay seconds on it
+#   tutorial  the game page's first run
+#   first_q   Play + sign-in until the first question is on screen
+#   results   the first Results view
+# and reports the median over --runs runs.
+#
+# Run from the repo root:
+#   python bench/cold_start.py --runs 5 --backend png --fresh-fonts --out cold_start.json
+#   python bench/cold_start.py --root /path/to/other/checkout    # the same measurement on another tree
+
+import argparse, importlib, json, os, statistics, subprocess, sys, tempfile, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ["pandas", "numpy", "matplotlib", "pyarrow", "PIL"]
+STEPS = ["import", "hub", "tutorial", "first_q", "results"]
+
+def loaded():
+    return [m for m in HEAVY if m in sys.modules]
+
+def child(args):
+    sys.path.insert(0, args.root)
+    out, t0 = {}, time.perf_counter()
+    importlib.import_module("mathgames.gamepage")
+    out["import"] = time.perf_counter() - t0; out["loaded_after_import"] = loaded()
+    from streamlit.testing.v1 import AppTest
+    from mathgames.games import get_game
+
+    def timed(step, fn):
+        t = time.perf_counter(); at = fn(); out[step] = time.perf_counter() - t
+        if at.exception: raise RuntimeError(f"{step}: {at.exception}")
+        return at
+
+    timed("hub", lambda: AppTest.from_file(os.path.join(args.root, "app.py"), default_timeout=120).run())
+    time.sleep(args.delay)
+    page = os.path.join(args.root, get_game(args.game).page)
+    at = timed("tutorial", lambda: AppTest.from_file(page, default_timeout=120).run())
+    def first_question():
+        at.sidebar.radio(key="nav").set_value("Play").run()
+        at.text_input[0].input("Student 1")
+        return at.button[0].click().run()
+    timed("first_q", first_question)
+    out["loaded_at_first_q"] = loaded()
+    timed("results", lambda: at.sidebar.radio(key="nav").set_value("Results").run())
+    try:        # let a background warm-up finish: exiting under a thread that is inside Matplotlib aborts
+        from mathgames import warmup
+        if warmup._thread: warmup._thread.join(); out["warmup_steps"] = warmup.STEPS
+    except ImportError:
+        pass
+    return out
+
+def run_once(args):
+    workdir = tempfile.mkdtemp(prefix="slope_cold_")
+    env = {**os.environ, "SLOPE_GRAPH_BACKEND": args.backend, "SLOPE_GRAPH_CACHE_DIR": os.path.join(workdir, "graphs")}
+    if args.fresh_fonts: env["MPLCONFIGDIR"] = os.path.join(workdir, "mpl")
+    cmd = [sys.executable, os.path.abspath(__file__), "--child", "--root", args.root, "--game", args.game,
+           "--backend", args.backend, "--delay", str(args.delay)]
+    proc = subprocess.run(cmd, cwd=workdir, env=env, capture_output=True, text=True)
+    if proc.returncode: sys.exit(proc.stderr[-2000:])
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Cold-start timings: page imports and time to the first question")
+    ap.add_argument("--root", default=ROOT, help="checkout to measure (default: this one)")
+    ap.add_argument("--game", default="slope_showdown")
+    ap.add_argument("--backend", choices=["svg", "canvas", "png"], default="svg")
+    ap.add_argument("--fresh-fonts", action="store_true", help="empty MPLCONFIGDIR (no Matplotlib font cache)")
+    ap.add_argument("--delay", type=float, default=2.0, help="seconds the student spends on the hub")
+    ap.add_argument("--runs", type=int, default=3)
+    ap.add_argument("--out", help="write the runs and medians as JSON")
+    ap.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+    args.root = os.path.abspath(args.root)
+    if args.child:
+        print(json.dumps(child(args))); return 0
+    runs = [run_once(args) for _ in range(args.runs)]
+    medians = {s: round(statistics.median(r[s] for r in runs) * 1000, 1) for s in STEPS}
+    for s in STEPS: print(f"{s:>9}  {medians[s]:>8.1f} ms")
+    print(f"page open -> first question {medians['tutorial'] + medians['first_q']:.1f} ms | "
+          f"loaded after import: {runs[0]['loaded_after_import']} | at first question: {runs[0]['loaded_at_first_q']}")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"config": {k: v for k, v in vars(args).items() if k != "child"}, "median_ms": medians, "runs": runs}, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
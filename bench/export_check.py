@@ -0,0 +1,70 @@
+# Export check: runs every Results download through Streamlit's own deferred-download conversion
+# (what happens when the button is clicked) and compares the file with the rows in storage.
+# Also checks that a name filter exports the rows the Results table shows, the admin panel's
+# Prometheus download, and Parquet over rows with blank numbers (old CSV logs, imported now and by
+# earlier versions that stored '' as is). Exits non-zero on any failure.
+#
+#   python bench/export_check.py --storage csv
+#   python bench/export_check.py --storage sqlite
+
+import argparse, gzip, io, os, sys, tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Check exports through Streamlit's deferred download path")
+    ap.add_argument("--storage", choices=["csv", "sqlite"], default="csv")
+    ap.add_argument("--rows", type=int, default=500)
+    args = ap.parse_args(argv)
+    os.environ["SLOPE_STORAGE"] = args.storage
+    os.chdir(tempfile.mkdtemp(prefix="slope_export_check_")); sys.path.insert(0, ROOT)
+    import pandas as pd
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+    from mathgames import export
+    from mathgames.metrics import METRICS
+    from mathgames.resultsindex import ResultsIndex
+    from mathgames.storage import get_storage
+
+    store = get_storage()
+    store.append("progress", [[f"2025-09-01T08:{i // 60 % 60:02d}:{i % 60:02d}", f"s{i // 15}", f"Student {i % 7}",
+                               str(i % 3 + 1), i % 15 + 1, 15, "Zero", "Positive", i % 2, i, i % 5, 4]
+                              for i in range(args.rows)])
+    expected = store.query("progress", period="2").reset_index(drop=True)
+    media = MediaFileManager(MemoryMediaFileStorage("/media"))
+    def click(data, mime, name):       # what a click on st.download_button(data=callable) runs
+        url = media.execute_deferred(media.add_deferred(data, mime, "check", name))
+        return media._storage.get_file(url.rsplit("/", 1)[-1].split(".")[0]).content
+    failures = []
+    for fmt in export.available_formats():
+        data = click(export.exporter(fmt, "progress", period="2"), export.FORMATS[fmt][0], export.file_name("progress", fmt))
+        if fmt == "parquet": got = pd.read_parquet(io.BytesIO(data))
+        else: got = pd.read_csv(io.BytesIO(gzip.decompress(data) if fmt == "csv.gz" else data), dtype=str, keep_default_na=False)
+        same = got.astype(str).values.tolist() == expected.astype(str).values.tolist()
+        print(f"{fmt:>8}  {len(data):>7} bytes  {len(got)} rows  {'OK' if same else 'MISMATCH'}")
+        if not same: failures.append(fmt)
+    # A name filter must pick the same rows as the Results table above the buttons (non-ASCII too).
+    store.append("summary", [["2025-09-02T08:00:00", "e1", "Émile Durand", "2", 3, 3, 15, 0]])
+    index = ResultsIndex(store, tables=("summary",)); index.catch_up()
+    data = click(export.exporter("csv", "summary", name="émile"), "text/csv", "names.csv")
+    shown, got = index.count("summary", name="émile"), len(pd.read_csv(io.BytesIO(data)))
+    print(f"{'names':>8}  table {shown} rows  export {got} rows  {'OK' if shown == got == 1 else 'MISMATCH'}")
+    if not shown == got == 1: failures.append("name filter")
+    data = click(METRICS.prometheus, "text/plain", "slope_metrics.prom")
+    print(f"{'prom':>8}  {len(data):>7} bytes  OK")
+
+    # Old-layout log (no class_period) with blank numeric fields, plus a row as older imports stored it.
+    if store.name != "sqlite" or not export.HAVE_PYARROW: return 1 if failures else 0
+    with open("legacy.csv", "w", encoding="utf-8") as f:
+        f.write("timestamp,session_id,name,score,best_streak,total_questions,won\n"
+                "2025-01-01T08:00:00,old1,Old Student,,3,15,\n2025-01-01T08:05:00,old2,Old Student,12,5,15,1\n")
+    store.import_csv("summary", "legacy.csv", force=True)
+    store.append("summary", [["2025-01-01T08:10:00", "old3", "Old Student", "unknown", "", "", 15, ""]])
+    got = pd.read_parquet(io.BytesIO(click(export.exporter("parquet", "summary", name="Old"), None, "legacy.parquet")))
+    ok = got[["score", "won"]].fillna(-1).values.tolist() == [[-1, -1], [12, 1], [-1, -1]]
+    print(f"{'legacy':>8}  {len(got)} rows  {'OK' if ok else 'MISMATCH ' + repr(got.values.tolist())}")
+    if not ok: failures.append("legacy parquet")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
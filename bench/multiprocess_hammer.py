@@ -0,0 +1,82 @@
+# Multi-process logging check: many worker processes append through the real log writer at once,
+# then every row is read back and verified (nothing lost, duplicated or corrupted, one header).
+# A reader polls the log through the incremental loader while the writers run.
+# Exits non-zero on any problem, so it can gate a deploy.
+#
+#   python bench/multiprocess_hammer.py --procs 16 --rows 2000 --storage csv
+#   python bench/multiprocess_hammer.py --procs 16 --rows 2000 --storage sqlite
+
+import argparse, multiprocessing as mp, os, sys, tempfile, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+NAME_PAD = "x" * 300          # long rows so one batch is far bigger than an atomic pipe write
+
+def worker(p, rows, ready, go):
+    sys.path.insert(0, ROOT)
+    from mathgames.engine import log_progress, log_summary
+    from mathgames.logwriter import LOG_WRITER
+    ready.release(); go.wait()                    # start together once every worker has imported
+    for r in range(rows):
+        log_progress(f"p{p}", f"{NAME_PAD}-{p}", str(p % 9 + 1), r, rows, "Zero", "Zero", 1, r, r, r)
+    log_summary(f"p{p}", f"{NAME_PAD}-{p}", str(p % 9 + 1), rows, rows, rows, True)
+    LOG_WRITER.close(timeout=60)
+
+def check(storage, procs, rows):
+    problems = []
+    progress, summary = storage.frame("progress"), storage.frame("summary")
+    if len(progress) != procs * rows: problems.append(f"progress rows: {len(progress)} != {procs * rows}")
+    if len(summary) != procs: problems.append(f"summary rows: {len(summary)} != {procs}")
+    seen = set()
+    for sid, name, q, choice in zip(progress["session_id"], progress["name"], progress["q_index"], progress["choice"]):
+        p = str(sid)[1:]
+        if name != f"{NAME_PAD}-{p}" or choice != "Zero": problems.append(f"corrupt row: {sid!r} {str(name)[-12:]!r} {choice!r}")
+        if (sid, int(q)) in seen: problems.append(f"duplicate row: {sid} {q}")
+        seen.add((sid, int(q)))
+        if len(problems) > 20: break
+    if storage.name == "csv":
+        path = storage.path("progress")
+        with open(path, encoding="utf-8") as f:
+            headers = sum(1 for line in f if line.startswith("timestamp,"))
+        if headers != 1: problems.append(f"{headers} header lines in {path}")
+    return problems
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Hammer the progress log from many processes and verify it")
+    ap.add_argument("--procs", type=int, default=16)
+    ap.add_argument("--rows", type=int, default=2000, help="progress rows per process")
+    ap.add_argument("--storage", choices=["csv", "sqlite"], default="csv")
+    ap.add_argument("--workdir", help="default: a fresh temp dir")
+    args = ap.parse_args(argv)
+
+    os.environ["SLOPE_STORAGE"] = args.storage
+    os.environ["SLOPE_LOG_BATCH_SIZE"] = "200"
+    workdir = args.workdir or tempfile.mkdtemp(prefix="slope_hammer_")
+    os.makedirs(workdir, exist_ok=True); os.chdir(workdir)
+    sys.path.insert(0, ROOT)
+    from mathgames.storage import get_storage
+    storage = get_storage(); storage.count("progress")     # reader warmed up before the writers start
+
+    ctx = mp.get_context("spawn")                  # fresh interpreters, like separate server workers
+    ready, go = ctx.Semaphore(0), ctx.Event()
+    procs = [ctx.Process(target=worker, args=(p, args.rows, ready, go)) for p in range(args.procs)]
+    for p in procs: p.start()
+    for _ in procs: ready.acquire()
+    start_at = time.time(); go.set()
+    polls, last, problems = 0, 0, []
+    while any(p.is_alive() for p in procs):       # concurrent reader: counts only ever grow
+        n = storage.count("progress")
+        if n < last: problems.append(f"reader saw the log shrink: {last} -> {n}")
+        last, polls = n, polls + 1
+        time.sleep(0.05)
+    for p in procs: p.join()
+    problems += [f"worker exited with {p.exitcode}" for p in procs if p.exitcode]
+    problems += check(storage, args.procs, args.rows)
+    took = time.time() - start_at
+    print(f"{args.storage}: {args.procs} procs x {args.rows} rows in {took:.2f}s "
+          f"({args.procs * args.rows / took:.0f} rows/s), {polls} concurrent reads, workdir {workdir}")
+    for msg in problems[:20]: print("PROBLEM:", msg)
+    print("OK" if not problems else f"FAILED ({len(problems)} problems)")
+    return 1 if problems else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+# Results browser timings: builds a synthetic progress log, indexes it (mathgames/resultsindex.py)
+# and times name/period/date filters plus paging against a plain scan of the frame, checking that
+# both give the same rows. Exits non-zero on any mismatch.
+#
+#   python bench/results_browse.py --rows 1000000 --storage csv
+#   python bench/results_browse.py --rows 200000 --storage sqlite --shuffle 0.01   # out-of-order batches
+
+import argparse, os, random, sys, tempfile, time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def synth_rows(n, shuffle, seed=0):
+    rng = random.Random(seed)
+    names = [f"{rng.choice(['Ada', 'Alan', 'Grace', 'Edsger', 'Barbara', 'Donald'])} {rng.choice('ABCDEFGHJKLMNPRSTW')}{i}"
+             for i in range(3000)]
+    t0, rows = datetime(2025, 9, 1, 8, 0), []
+    for i in range(n):
+        t = t0 + timedelta(seconds=i * 30)
+        if rng.random() < shuffle: t -= timedelta(seconds=rng.randint(1, 3600))   # a late batch from another worker
+        name = rng.choice(names)
+        rows.append([t.isoformat(timespec="seconds"), f"s{i // 15}", name, str(hash(name) % 7 + 1), i % 15 + 1, 15,
+                     "Zero", "Positive", i % 2, i, i % 5, 4])
+    return rows
+
+def timed(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter(); out = fn(); best = min(best, time.perf_counter() - t)
+    return out, best * 1000
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Time the indexed Results browser against a full scan")
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--storage", choices=["csv", "sqlite"], default="csv")
+    ap.add_argument("--shuffle", type=float, default=0.0, help="fraction of rows logged out of time order")
+    args = ap.parse_args(argv)
+
+    os.environ["SLOPE_STORAGE"] = args.storage
+    os.chdir(tempfile.mkdtemp(prefix="slope_browse_"))
+    sys.path.insert(0, ROOT)
+    import pandas as pd
+    from mathgames.storage import get_storage
+    from mathgames.resultsindex import ResultsIndex
+
+    store = get_storage()
+    rows = synth_rows(args.rows, args.shuffle)
+    for i in range(0, len(rows), 100_000): store.append("progress", rows[i:i + 100_000])
+    frame = store.frame("progress")
+    index = ResultsIndex(store, tables=("progress",))
+    _, build_ms = timed(index.rebuild, repeat=1)
+    _, tail_ms = timed(index.catch_up)
+    print(f"{args.storage}: {args.rows} rows, index built in {build_ms:.0f} ms, no-op catch-up {tail_ms:.2f} ms")
+
+    ts = pd.to_datetime(frame["timestamp"].astype(str))
+    mid = ts.iloc[len(ts) // 2].normalize()
+    cases = {
+        "period":      dict(period="3"),
+        "name 'ada'":  dict(name="ada"),
+        "name 'ce B1'": dict(name="ce B1"),
+        "name+period": dict(name="grace", period="5"),
+        "one week":    dict(since=mid, until=mid + timedelta(days=7)),
+        "all filters": dict(name="an", period="2", since=mid - timedelta(days=30), until=mid),
+        "everything":  dict(),
+    }
+    failures = 0
+    for label, f in cases.items():
+        def scan():
+            m = pd.Series(True, index=frame.index)
+            if "name" in f: m &= frame["name"].str.contains(f["name"], case=False, regex=False)
+            if "period" in f: m &= frame["class_period"] == f["period"]
+            if "since" in f: m &= (ts >= f["since"]) & (ts < f["until"])
+            return frame[m]
+        (page, total), idx_ms = timed(lambda: index.page("progress", 0, 100, **f))
+        expected, scan_ms = timed(scan, repeat=2)
+        want = expected.iloc[::-1].iloc[:100]
+        ok = total == len(expected) and page["session_id"].astype(str).tolist() == want["session_id"].astype(str).tolist()
+        failures += not ok
+        print(f"{label:>13}: {total:>8} hits  index {idx_ms:7.2f} ms   scan {scan_ms:8.1f} ms   {'OK' if ok else 'MISMATCH'}")
+    last_page = (index.count("progress") - 1) // 100
+    (page, total), ms = timed(lambda: index.page("progress", last_page, 100))
+    print(f"  oldest page: {len(page)} rows in {ms:.2f} ms")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
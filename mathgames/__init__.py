@@ -0,0 +1 @@
+# Shared helpers for the Math Games Hub pages (rendering, caching, logging).
@@ -0,0 +1,104 @@
+# Incremental CSV loader for the append-only logs.
+# Each file keeps one parsed DataFrame per process plus the byte offset/mtime/inode it was read
+# up to; a reload only parses the bytes appended since then. Rows are normalised the same way
+# as load_csv_flex's fallback (legacy 11-column rows get class_period = "unknown").
+
+import csv, io, os, threading
+from .metrics import timed
+
+CATEGORY_COLS = ["class_period", "choice", "answer"]
+NUMERIC_COLS = ["q_index", "total_questions", "correct", "score_after", "streak_after", "best_streak",
+                "score", "won"]
+
+def normalize_row(row, cols, mapping=None, header_len=None, insert_index=3, fill_value="unknown"):
+    if mapping is not None and len(row) == header_len:
+        return [row[j] for j in mapping]
+    if len(row) == len(cols)-1: row.insert(insert_index, fill_value)
+    elif len(row) > len(cols): row = row[:len(cols)]
+    elif len(row) < len(cols): row += [""]*(len(cols)-len(row))
+    return row
+
+class TailFrame:
+    def __init__(self, path, cols, insert_index=3, fill_value="unknown"):
+        self.path, self.cols = path, list(cols)
+        self.insert_index, self.fill_value = insert_index, fill_value
+        self._lock = threading.Lock()
+        self._reset()
+        self.full_loads = self.tail_loads = 0
+
+    def _reset(self):
+        self.df = None; self.offset = 0; self.mtime = None; self.ino = None
+        self._mapping = self._header_len = None
+
+    def _parse(self, data):
+        import pandas as pd
+        if self.offset == 0:
+            nl = data.find(b"\n") + 1
+            header = next(csv.reader([data[:nl].decode("utf-8")]), [])
+            if set(self.cols) <= set(header):
+                self._mapping, self._header_len = [header.index(c) for c in self.cols], len(header)
+            data = data[nl:]
+        if self._mapping == list(range(len(self.cols))) and self._header_len == len(self.cols):
+            try:    # current layout: let pandas' C parser do it
+                return pd.read_csv(io.BytesIO(data), header=None, names=self.cols, dtype=str, keep_default_na=False)
+            except (ValueError, pd.errors.ParserError):
+                pass
+        rows = csv.reader(io.StringIO(data.decode("utf-8"), newline=""))
+        return [normalize_row(r, self.cols, self._mapping, self._header_len, self.insert_index, self.fill_value)
+                for r in rows if r]
+
+    def _typed(self, rows, like=None):
+        import pandas as pd
+        df = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame(rows, columns=self.cols, dtype=str)
+        for c in df.columns:
+            if c in NUMERIC_COLS:
+                df[c] = pd.to_numeric(df[c], errors="coerce").astype("Int64")
+            elif c in CATEGORY_COLS:
+                cats = like[c].cat.categories if like is not None else pd.Index([], dtype=str)
+                extra = pd.Index(df[c].dropna().unique()).difference(cats)
+                df[c] = pd.Categorical(df[c], categories=cats.append(extra))    # like's categories first
+        return df
+
+    @timed("csv.read")
+    def read(self):
+        """Return the cached frame, parsing only what was appended since the last call (None if no file)."""
+        import pandas as pd
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            with self._lock: self._reset()
+            return None
+        with self._lock:
+            if self.df is not None and st.st_ino == self.ino and st.st_size == self.offset and st.st_mtime_ns == self.mtime:
+                return self.df
+            if self.df is None or st.st_ino != self.ino or st.st_size < self.offset or st.st_size == self.offset:
+                self._reset(); self.full_loads += 1     # new, truncated, replaced or rewritten in place
+            else:
+                self.tail_loads += 1
+            with open(self.path, "rb") as f:
+                f.seek(self.offset); data = f.read(st.st_size - self.offset)
+            end = data.rfind(b"\n") + 1                 # only whole lines; a row may be mid-write
+            rows = self._parse(data[:end])
+            if self.df is None:
+                self.df = self._typed(rows)
+            elif len(rows):
+                old, new = self.df, self._typed(rows, like=self.df)
+                wider = [c for c in CATEGORY_COLS if c in new.columns and len(new[c].cat.categories) > len(old[c].cat.categories)]
+                if wider:   # the cached frame is shared with readers: widen the categories on a copy
+                    old = old.copy(deep=False)
+                    for c in wider: old[c] = old[c].cat.set_categories(new[c].cat.categories)   # no recode
+                self.df = pd.concat([old, new], ignore_index=True)
+            self.offset += end; self.ino = st.st_ino; self.mtime = st.st_mtime_ns
+            return self.df
+
+_frames = {}
+_frames_lock = threading.Lock()
+
+def load_csv_cached(path, cols, insert_index=3, fill_value="unknown"):
+    """Process-wide, incrementally refreshed frame for path. Shared by all sessions: do not mutate."""
+    key = (os.path.abspath(path), tuple(cols))
+    with _frames_lock:
+        tf = _frames.get(key)
+        if tf is None:
+            tf = _frames[key] = TailFrame(path, cols, insert_index, fill_value)
+    return tf.read()
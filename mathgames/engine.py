@@ -0,0 +1,123 @@
+# Game engine: scoring, question flow and logging with no Streamlit in sight, for any game in
+# the registry (mathgames/games.py; Slope Showdown by default).
+# The game pages are a thin view over this; the load-test harness drives it directly.
+# Import-light on purpose: nothing here pulls in Matplotlib, NumPy or pandas.
+
+from datetime import datetime
+from .graphs import GRAPH_BACKEND
+from .logwriter import LOG_WRITER
+from .metrics import timed
+from .questions import assignment_set, build_graph_set, derive_seed
+from .games import get_game
+
+NUM_QUESTIONS = 15
+MIN_SCORE_TO_WIN = 10                             # auto-end threshold
+
+# ---------------- Logging Helpers ----------------
+# Rows are queued for the process-wide background writer (mathgames/logwriter.py), which
+# appends them in batches to the storage backend (SLOPE_STORAGE=csv|sqlite, mathgames/storage.py);
+# call LOG_WRITER.flush() before reading them back. `table` is the game's progress/summary table.
+@timed("append_row")
+def _append_row(table, row):
+    LOG_WRITER.submit(table, row)
+
+def log_progress(session_id, name, class_period, q_index, total, choice, answer, correct, score_after, streak_after, best_streak, table="progress"):
+    _append_row(
+        table,
+        [datetime.now().isoformat(timespec="seconds"), session_id, name, class_period, q_index, total, choice, answer, int(correct), score_after, streak_after, best_streak],
+    )
+
+def log_summary(session_id, name, class_period, score, best_streak, total, won, table="summary"):
+    _append_row(
+        table,
+        [datetime.now().isoformat(timespec="seconds"), session_id, name, class_period, score, best_streak, total, int(won)],
+    )
+
+# ---------------- State ----------------
+class GameState:
+    __slots__ = ("session_id", "name", "class_period", "assignment", "game_no", "questions", "index", "score",
+                 "streak", "best_streak", "answered", "selected", "last_delta", "auto_finished", "summary_logged")
+
+    def __init__(self, name="", class_period="", session_id="", assignment=None):
+        self.name, self.class_period, self.session_id = name, class_period, session_id
+        self.assignment, self.game_no = assignment, 0
+        self.questions = ()
+        self.index = self.score = self.streak = self.best_streak = self.last_delta = 0
+        self.answered = self.auto_finished = self.summary_logged = False
+        self.selected = None
+
+    @property
+    def total(self):
+        return len(self.questions)
+
+class GameEngine:
+    __slots__ = ("num_questions", "min_score", "backend", "log_progress", "log_summary", "game")
+
+    def __init__(self, num_questions=NUM_QUESTIONS, min_score=MIN_SCORE_TO_WIN, backend=GRAPH_BACKEND,
+                 log_progress=log_progress, log_summary=log_summary, game=None):
+        self.num_questions, self.min_score, self.backend = num_questions, min_score, backend
+        self.log_progress, self.log_summary = log_progress, log_summary
+        self.game = get_game(game)           # a GameSpec or a registered game id
+
+    def new_game(self, name="", class_period="", session_id="", seed=None, assignment=None):
+        state = GameState(name, class_period, session_id, assignment)
+        return self.reset(state, seed=seed)
+
+    def reset(self, state, seed=None):
+        # Seeds come from the session (session_id, game number) or the shared assignment code,
+        # never from the global RNG, so concurrent sessions cannot disturb each other's games.
+        state.game_no += 1
+        if state.assignment:
+            state.questions = assignment_set(state.assignment, self.num_questions, self.backend, self.game)
+        else:
+            if seed is None and state.session_id: seed = derive_seed(state.session_id, state.game_no)
+            state.questions = build_graph_set(self.num_questions, seed=seed, backend=self.backend, game=self.game)   # lazy
+        state.index = state.score = state.streak = state.best_streak = state.last_delta = 0
+        state.answered = state.auto_finished = state.summary_logged = False
+        state.selected = None
+        return state
+
+    def current(self, state):
+        return state.questions[state.index] if state.index < state.total else None
+
+    def won(self, state):
+        return state.score >= self.min_score
+
+    def submit(self, state, choice):
+        """Score the current question. Returns True/False, or None if it was already answered."""
+        if state.answered: return None
+        q = self.current(state)
+        state.answered, state.selected = True, choice
+        correct = (choice == q.answer)
+        if correct:
+            state.streak += 1
+            state.last_delta = int(round(1.5 * state.streak))
+            state.score += state.last_delta
+            state.best_streak = max(state.best_streak, state.streak)
+        else:
+            state.streak = 0
+            state.score -= 1
+            state.last_delta = -1
+        self.log_progress(state.session_id or "na", state.name or "Anon", state.class_period or "unknown",
+                          state.index+1, state.total, choice if choice is not None else "", q.answer, int(correct),
+                          state.score, state.streak, state.best_streak, table=self.game.tables["progress"])
+        if self.won(state):
+            state.auto_finished = True
+            self.finish(state)
+        return correct
+
+    def next(self, state):
+        state.index += 1
+        state.answered = False
+        state.selected = None
+
+    def finish(self, state):
+        """Log the game summary once; returns whether the game was won."""
+        won = self.won(state)
+        if not state.summary_logged:
+            self.log_summary(state.session_id or "na", state.name or "Anon", state.class_period or "unknown",
+                             state.score, state.best_streak, state.total, won, table=self.game.tables["summary"])
+            state.summary_logged = True
+        return won
+
+ENGINE = GameEngine()
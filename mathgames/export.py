@@ -0,0 +1,94 @@
+# Results exports (CSV, gzipped CSV, Parquet), generated only when asked for.
+# Rows come from the storage backend chunk by chunk with the name/period filters and the column
+# projection pushed down (storage.chunks), and are written straight into a temp file on disk that
+# the download button then reads once (Streamlit keeps the download itself in memory).
+# Parquet needs pyarrow; without it the format is simply not offered.
+# Run: python -m mathgames.export <table> out.csv.gz [--name N] [--period P] [--columns a,b]
+#      (table: progress/summary for Slope Showdown, <game id>_progress/_summary for the others)
+
+import argparse, csv, functools, gzip, importlib.util, io, os, sys, tempfile
+from .metrics import timed
+from .storage import TABLES, TEXT_COLS, CHUNK_ROWS, get_storage, project
+
+HAVE_PYARROW = importlib.util.find_spec("pyarrow") is not None      # checked without importing it
+
+FORMATS = {   # format -> (mime type, file suffix)
+    "csv":     ("text/csv", ".csv"),
+    "csv.gz":  ("application/gzip", ".csv.gz"),
+    "parquet": ("application/vnd.apache.parquet", ".parquet"),
+}
+
+def available_formats():
+    return [f for f in FORMATS if f != "parquet" or HAVE_PYARROW]
+
+def file_name(table, fmt):
+    return os.path.splitext(TABLES[table]["csv"])[0] + FORMATS[fmt][1]
+
+def iter_csv(table, columns=None, name=None, period=None, store=None, chunk_rows=CHUNK_ROWS, since=None, until=None):
+    """CSV bytes, header first, then one block per storage chunk."""
+    cols = project(table, columns)
+    header = io.StringIO(); csv.writer(header, lineterminator="\n").writerow(cols)
+    yield header.getvalue().encode("utf-8")
+    for chunk in (store or get_storage()).chunks(table, cols, name, period, chunk_rows, since, until):
+        yield chunk.to_csv(index=False, header=False, lineterminator="\n").encode("utf-8")
+
+def write_parquet(out, table, columns=None, name=None, period=None, store=None, chunk_rows=CHUNK_ROWS, since=None, until=None):
+    import pandas as pd, pyarrow as pa, pyarrow.parquet as pq
+    cols = project(table, columns)
+    # Fixed schema, so chunks whose columns happen to be all-null or categorical still line up.
+    schema = pa.schema([(c, pa.string() if c in TEXT_COLS else pa.int64()) for c in cols])
+    with pq.ParquetWriter(out, schema, compression="zstd") as writer:
+        for chunk in (store or get_storage()).chunks(table, cols, name, period, chunk_rows, since, until):
+            for c in cols:      # rows imported from old CSVs can hold '' (or junk) in numeric columns
+                if c not in TEXT_COLS: chunk[c] = pd.to_numeric(chunk[c], errors="coerce")
+            chunk = chunk.astype({c: "string" if c in TEXT_COLS else "Int64" for c in cols})
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+def write_export(out, fmt, table, columns=None, name=None, period=None, store=None, chunk_rows=CHUNK_ROWS, since=None, until=None):
+    """Write one export to the binary file object `out`, a chunk at a time."""
+    if fmt not in available_formats(): raise ValueError(f"export format must be one of {available_formats()}, got {fmt!r}")
+    if fmt == "parquet":
+        return write_parquet(out, table, columns, name, period, store, chunk_rows, since, until)
+    if fmt == "csv.gz":
+        out = gzip.GzipFile(fileobj=out, mode="wb", compresslevel=6, mtime=0)
+    for block in iter_csv(table, columns, name, period, store, chunk_rows, since, until):
+        out.write(block)
+    if fmt == "csv.gz": out.close()       # finishes the gzip stream; the underlying file stays open
+
+@timed("export")
+def export_file(fmt, table, columns=None, name=None, period=None, store=None, since=None, until=None):
+    """The finished export as an open binary file (a BufferedReader, which st.download_button accepts)."""
+    with tempfile.NamedTemporaryFile(prefix="slope_export_", suffix=FORMATS[fmt][1], delete=False) as out:
+        try:
+            write_export(out, fmt, table, columns, name, period, store, since=since, until=until)
+        except BaseException:
+            out.close(); os.unlink(out.name); raise
+    f = open(out.name, "rb")
+    try:
+        os.unlink(out.name)          # POSIX: the open handle keeps the data until it is read
+    except OSError:                  # Windows cannot remove an open file: hand over the bytes instead
+        with f: data = f.read()
+        os.unlink(out.name)
+        return data
+    return f
+
+def exporter(fmt, table, columns=None, name=None, period=None, since=None, until=None):
+    """Zero-argument callable for st.download_button(data=...): runs only when the button is clicked."""
+    return functools.partial(export_file, fmt, table, tuple(columns) if columns else None, name, period,
+                             since=since, until=until)
+
+if __name__ == "__main__":
+    from .games import GAMES      # registers every game's tables (y_intercept_progress, ...)
+    ap = argparse.ArgumentParser(description="Export game logs")
+    ap.add_argument("table", choices=sorted(TABLES), help=f"one of the tables of the games {', '.join(GAMES)}")
+    ap.add_argument("out", help="output path; the format follows the suffix (.csv, .csv.gz, .parquet)")
+    ap.add_argument("--name"); ap.add_argument("--period")
+    ap.add_argument("--since", help="ISO date/time, inclusive"); ap.add_argument("--until", help="ISO date/time, exclusive")
+    ap.add_argument("--columns", help="comma-separated column list (default: all)")
+    args = ap.parse_args()
+    fmt = next((f for f, (_, suffix) in FORMATS.items() if args.out.endswith(suffix)), None)
+    if fmt is None: sys.exit(f"unrecognised suffix on {args.out} (use one of {[s for _, s in FORMATS.values()]})")
+    with open(args.out, "wb") as f:
+        write_export(f, fmt, args.table, args.columns.split(",") if args.columns else None, args.name, args.period,
+                     since=args.since, until=args.until)
+    print(f"wrote {args.out} ({os.path.getsize(args.out)} bytes)")
@@ -0,0 +1,291 @@
+# Shared Streamlit page for every game in the registry (mathgames/games.py):
+# tutorial -> sign-in (with class period) -> game (HUD, auto-end at MIN_SCORE_TO_WIN) -> results.
+# Each page in pages/ is two lines: run("<game id>"). The page is a thin view over the engine;
+# each game's session state lives under its id, so several games can be open in one session.
+
+import streamlit as st
+import hmac, os, uuid
+from datetime import timedelta
+from types import SimpleNamespace
+
+from .engine import GameEngine
+from .games import get_game
+from .graphs import GRAPHS, BACKEND_STYLES
+from .logwriter import LOG_WRITER
+from .metrics import METRICS
+from .storage import TABLES
+from .resultsindex import PAGE_SIZES
+from . import export, ui, warmup
+
+# ---------------- Config ----------------
+DEFAULT_PERIODS = ["1","2","3","4","5","6","7","8","9","Other…"]
+ADMIN_TOKEN = os.environ.get("SLOPE_ADMIN_TOKEN", "")     # ?admin=<token> shows the timing panel
+_engines = {}
+
+def engine_for(game):
+    if game.id not in _engines: _engines[game.id] = GameEngine(game=game)
+    return _engines[game.id]
+
+def chip(text, ok=True):
+    st.markdown(ui.chip_html(text, ok), unsafe_allow_html=True)
+
+def hud(g, min_score):
+    st.markdown(ui.hud_html(g.score, g.streak, g.best_streak, g.index + 1, g.total, min_score), unsafe_allow_html=True)
+
+# ---------------- Graph Display ----------------
+# Questions are generated lazily by the engine; images come from the shared pre-render cache.
+# backend: "svg" (default), "canvas" or "png".
+def show_graph(q, backend, caption=None):
+    image = q.image_for(backend)
+    if backend == "canvas":
+        st.components.v1.html(image, height=370)
+        if caption: st.caption(caption)
+    else:
+        st.image(image, caption=caption, width="stretch")
+    return len(image)
+
+def compare_backends():
+    # ?graph=png,svg shows the same question through several backends side by side.
+    wanted = [b for b in st.query_params.get("graph", "").split(",") if b in BACKEND_STYLES]
+    return wanted if len(wanted) > 1 else None
+
+# ---------------- Results browser ----------------
+# Filtering and paging run on prebuilt indexes (mathgames/resultsindex.py) that catch up on new
+# rows incrementally, so every rerun costs milliseconds however long the history is.
+def browse(index, table, what):
+    c1, c2, c3 = st.columns([2, 1, 2])
+    with c1:
+        name = st.text_input("Filter by name:", key=f"{table}_name").strip() or None
+    with c2:
+        period = st.selectbox("Class Period:", ["(all)"] + index.periods(table), key=f"{table}_period")
+    with c3:
+        dates = st.date_input("Dates:", value=[], key=f"{table}_dates")
+    since = dates[0] if dates else None
+    until = dates[-1] + timedelta(days=1) if dates else None
+    filters = {"name": name, "period": None if period == "(all)" else period, "since": since, "until": until}
+    c1, c2 = st.columns([3, 1])
+    with c2:
+        size = st.selectbox("Rows per page:", PAGE_SIZES, index=1, key=f"{table}_size")
+    pages = max(1, -(-index.count(table, **filters) // size))
+    with c1:   # keyed on the filters, so changing them goes back to page 1
+        page = st.number_input(f"Page (of {pages}):", min_value=1, max_value=pages, value=1,
+                               key=f"{table}_page:{name}:{period}:{since}:{until}:{size}")
+    rows, total = index.page(table, page - 1, size, **filters)
+    st.caption(f"{total} matching {what}, newest first")
+    st.dataframe(rows, width="stretch", hide_index=True)
+    return filters
+
+# ---------------- Exports ----------------
+# The file is only built when the button is clicked (Streamlit calls the exporter on demand),
+# streamed from storage with the filters and column choice pushed down (mathgames/export.py).
+def download(table, label, name=None, period=None, since=None, until=None):
+    c1, c2, c3 = st.columns([1, 2, 1])
+    with c1:
+        fmt = st.selectbox("Format", export.available_formats(), key=f"fmt_{table}")
+    with c2:
+        cols = st.multiselect("Columns", TABLES[table]["cols"], key=f"cols_{table}", placeholder="All columns")
+    with c3:
+        st.write("")
+        st.download_button(label, data=export.exporter(fmt, table, cols, name, period, since, until),
+                           file_name=export.file_name(table, fmt), mime=export.FORMATS[fmt][0])
+
+# ---------------- Admin ----------------
+def is_admin():
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(st.query_params.get("admin", ""), ADMIN_TOKEN)
+
+def admin_panel():
+    with st.sidebar.expander("⏱ Timings (admin)", expanded=True):
+        if not METRICS.enabled:
+            st.caption("Start the server with SLOPE_METRICS=1 to record timings.")
+        else:
+            st.write("This rerun:")
+            st.dataframe([{"op": n, "calls": c, "ms": round(t * 1000, 2)} for n, c, t in METRICS.rerun_trace()],
+                         hide_index=True, width="stretch")
+            st.write("This process:")
+            st.dataframe([{"op": n, "calls": h["count"], "mean_ms": round(h["sum"] / h["count"] * 1000, 2),
+                           "p95_le_ms": h["p95"] * 1000, "max_ms": round(h["max"] * 1000, 2)}
+                          for n, h in sorted(METRICS.snapshot()["histograms"].items())],
+                         hide_index=True, width="stretch")
+            st.download_button("Prometheus text", data=METRICS.prometheus, file_name="slope_metrics.prom", mime="text/plain")
+        st.json({"graphs": GRAPHS.stats(), "log_writer": LOG_WRITER.stats(), "warmup": warmup.STEPS}, expanded=False)
+
+# ---------------- Stages ----------------
+def tutorial(game, ss):
+    if game.tutorial:
+        intro, html = game.tutorial
+        st.markdown(intro, unsafe_allow_html=True)
+        st.components.v1.html(html, height=560)
+    else:
+        st.markdown(f"<div class='sub'>{game.blurb}. {game.prompt}</div>", unsafe_allow_html=True)
+    if st.button("Got it — Let’s Play →", type="primary"):
+        ss.stage = "signin"; st.rerun()
+
+def signin(game, ss, engine):
+    with st.form("signin"):
+        name = st.text_input("Enter your name:", max_chars=40, placeholder="First & Last")
+        period_choice = st.selectbox("Class Period:", DEFAULT_PERIODS, index=0)
+        custom_period = ""
+        if period_choice == "Other…":
+            custom_period = st.text_input("Enter period / class (e.g., 'Advisory' or 'A2'):", max_chars=20)
+        go = st.form_submit_button("Start Game →")
+        if go:
+            period_final = custom_period.strip() if period_choice == "Other…" else period_choice
+            if not name.strip() or not period_final:
+                st.warning("Please enter both your name and class period.")
+            else:
+                # ?assignment=CODE gives the whole class the same (pre-rendered) question set.
+                ss.game = engine.new_game(name.strip(), period_final, uuid.uuid4().hex[:12],
+                                          assignment=st.query_params.get("assignment") or None)
+                ss.stage = "game"; st.rerun()
+
+def play(game, ss, engine):
+    g = ss.game
+    i, score, total = g.index, g.score, g.total
+
+    st.caption(f"Player: **{g.name or 'Anon'}** | Period: **{g.class_period or 'unknown'}** | Session: {g.session_id or 'na'}"
+               + (f" | Assignment: **{g.assignment}**" if g.assignment else ""))
+    try:
+        st.progress((i)/total if total>0 else 0.0, text=f"Q: {i}/{total}   |   Score: {score}   |   Streak: {g.streak} (Best: {g.best_streak})")
+    except TypeError:
+        st.progress((i)/total if total>0 else 0.0)
+
+    hud(g, engine.min_score)
+
+    if i < total:
+        q = engine.current(g)
+        st.markdown("<div class='card'>", unsafe_allow_html=True)
+        backends = compare_backends()
+        if backends:
+            for col, backend in zip(st.columns(len(backends)), backends):
+                with col:
+                    size = show_graph(q, backend)
+                    st.caption(f"{backend}: {size/1024:.1f} KB")
+        else:
+            show_graph(q, q.backend, caption=game.prompt)
+        st.markdown("</div>", unsafe_allow_html=True)
+
+        selected = st.radio("Pick one:", q.choices, index=None, key=f"radio_{i}")
+        g.selected = selected
+
+        if st.button("Submit", type="primary"):
+            if engine.submit(g, selected) is None:
+                st.stop()
+            if g.auto_finished:
+                ss.stage = "results"
+                st.rerun()
+
+        cols = st.columns(2)
+        for idx, choice in enumerate(q.choices):
+            css = "choice"
+            if g.answered:
+                if choice == q.answer:
+                    css += " correct"
+                elif g.selected == choice:
+                    css += " incorrect"
+            else:
+                if g.selected == choice:
+                    css += " selected"
+            with cols[idx % 2]:
+                st.markdown(f"<div class='{css}'>{choice}</div>", unsafe_allow_html=True)
+
+        if g.answered:
+            if g.selected == q.answer:
+                chip(f"Correct! +{g.last_delta} (streak x{g.streak})", ok=True)
+            else:
+                chip("Incorrect. -1 point. Streak reset.", ok=False)
+            if st.button("Next →", type="primary"):
+                engine.next(g)
+                st.rerun()
+    else:
+        won = engine.finish(g)
+
+        st.success("🎉 Finished!")
+        st.metric("Final Score", f"{score} / {total} (best streak: {g.best_streak})")
+        if won: chip(f"✅ Reached {engine.min_score} points! Game complete.", ok=True)
+        else: chip(f"Game complete. You need {engine.min_score}+ to auto-finish.", ok=False)
+        c1, c2 = st.columns(2)
+        with c1:
+            if st.button("Play Again", width="stretch"):
+                engine.reset(g); st.rerun()
+        with c2:
+            if st.button("View Results", width="stretch"):
+                ss.stage = "results"; st.rerun()
+
+def results(game, ss, engine):
+    import pandas as pd           # only this stage needs pandas; the warm-up has usually loaded it by now
+    index, rollups, tables = game.results_index, game.rollups, game.tables
+    st.markdown("### 📊 Live Results")
+    if not LOG_WRITER.flush():
+        st.warning("Some answers could not be saved yet (they will be retried), so the latest may be missing below.")
+    index.catch_up()
+    if index.total(tables["progress"]):
+        filters = browse(index, tables["progress"], "submissions")
+        download(tables["progress"], "Download progress", **filters)
+    else:
+        st.info("No question submissions logged yet.")
+
+    st.markdown("### 🧾 Game Summaries")
+    if index.total(tables["summary"]):
+        filters = browse(index, tables["summary"], "games")
+        download(tables["summary"], "Download summaries", **filters)
+        # Same filters as the table above, so the totals agree with it.
+        games, wins = index.count(tables["summary"], **filters), index.wins(tables["summary"], **filters)
+        st.write(f"Total games: **{games}**, Winners (score ≥ {engine.min_score}): **{wins}**")
+    else:
+        st.info("No completed games yet.")
+
+    # Pre-aggregated per-period / per-student rollups (mathgames/rollups.py), kept current on write.
+    st.markdown("### 📈 Class Analytics")
+    rollups.catch_up()
+    if rollups.periods:
+        st.dataframe(pd.DataFrame(rollups.period_rows()), width="stretch", hide_index=True)
+        c1, c2 = st.columns(2)
+        with c1:
+            a_period = st.selectbox("Students in period:", sorted(rollups.periods), index=0)
+        students = rollups.student_rows(a_period)
+        with c2:
+            a_student = st.selectbox("Confusion matrix for:", ["(whole period)"] + [r["name"] for r in students], index=0)
+        st.dataframe(pd.DataFrame(students), width="stretch", hide_index=True)
+        cm = pd.DataFrame(rollups.confusion(a_period, None if a_student == "(whole period)" else a_student)).T
+        cm.index.name = "picked \\ correct"
+        st.dataframe(cm, width="stretch")
+    else:
+        st.info("No analytics yet.")
+    if st.button("Back to Play"):
+        ss.stage = "signin" if not ss.game.name else "game"; st.rerun()
+
+STAGES = {"tutorial": tutorial, "signin": signin, "game": play, "results": results}
+
+# ---------------- Page ----------------
+def run(game_id):
+    game = get_game(game_id)
+    engine = engine_for(game)
+    st.set_page_config(page_title=game.title, page_icon=game.icon, layout="centered")
+    METRICS.begin_rerun()                      # SLOPE_METRICS=1: per-rerun timings for the admin panel
+    rerun_span = METRICS.span("rerun").start()
+    st.markdown(ui.CSS, unsafe_allow_html=True)
+    warmup.start(engine.backend)              # fonts, pandas, common images: once per process
+
+    if game.id not in st.session_state:
+        st.session_state[game.id] = SimpleNamespace(stage="tutorial", game=engine.new_game())
+    ss = st.session_state[game.id]
+
+    stage_to_tab = {"tutorial":0, "signin":1, "game":1, "results":2}
+    with st.sidebar:
+        st.header("Menu")
+        tab_idx = stage_to_tab.get(ss.stage, 0)
+        dest = st.radio("Go to:", ["Tutorial","Play","Results"], index=tab_idx, key="nav")
+        if dest == "Tutorial" and ss.stage != "tutorial":
+            ss.stage = "tutorial"; st.rerun()
+        elif dest == "Play" and ss.stage not in ["signin","game"]:
+            ss.stage = "signin" if not ss.game.name else "game"; st.rerun()
+        elif dest == "Results" and ss.stage != "results":
+            ss.stage = "results"; st.rerun()
+
+    st.markdown(f"<div class='big'>{game.icon} {game.title}</div>", unsafe_allow_html=True)
+    stage_span = METRICS.span(f"stage.{ss.stage}").start()    # st.rerun() mid-stage skips the record
+    stage = STAGES[ss.stage]
+    if stage is tutorial: stage(game, ss)
+    else: stage(game, ss, engine)
+    stage_span.stop(); rerun_span.stop()
+    if is_admin(): admin_panel()
@@ -0,0 +1,157 @@
+# Game registry for the hub. A game is a GameSpec: the parameter space of its question specs,
+# how to draw one at random, its answer and choices, and how a spec maps to an image key in the
+# shared graph cache (plus a renderer when its images are not plain lines).
+# Everything else is shared, so a new game is as fast as Slope Showdown from day one: the
+# pre-render cache (mathgames/graphs.py), the engine and batched logging (each game gets its own
+# progress/summary tables in the same backend), the Results browser, rollups and exports
+# (mathgames/gamepage.py), and the load-test harness (bench/classroom_load.py --game).
+# Adding a game: register(GameSpec(...)) below and add a page that calls gamepage.run("<id>").
+# Run: python -m mathgames.games [warm [backend]]   (list the games / pre-render all their images)
+
+import sys, threading
+from fractions import Fraction
+from .graphs import GRAPHS, RENDERERS, SLOPES, SLOPE_TYPES, LEVELS, BACKEND_STYLES, GRAPH_BACKEND, graph_key, param_space, draw
+from .questions import random_spec, spec_key
+from .storage import register_tables
+from . import ui
+
+class GameSpec:
+    def __init__(self, id, title, icon, blurb, prompt, params, random_spec, answer, choices, key,
+                 renderer=None, labels=None, tables=None, page=None, tutorial=None):
+        self.id, self.title, self.icon, self.blurb, self.prompt = id, title, icon, blurb, prompt
+        self.params = params                  # () -> every spec the game can ask (finite: it is pre-rendered)
+        self.random_spec = random_spec        # rng -> spec; must only use rng, so games replay from their seed
+        self.answer, self.choices = answer, choices     # spec -> str / spec -> [str]
+        self.key = key                        # (spec, backend) -> graph cache key
+        self.renderer = renderer              # key -> image, for keys whose first item is the game id
+        self.labels = labels                  # fixed answer set (per-type accuracy, confusion axes), or None
+        self.tables = tables or register_tables(id)
+        self.page = page or f"pages/{id}.py"
+        self.tutorial = tutorial              # (intro html, component html), or None
+        self._rollups = self._index = None
+        self._lock = threading.Lock()         # a class opening Results at once must not build two followers
+
+    def keys(self, backend=GRAPH_BACKEND):
+        return [self.key(spec, backend) for spec in self.params()]
+
+    @property
+    def rollups(self):
+        if self._rollups is None:
+            from .rollups import ROLLUPS, Rollups
+            with self._lock:
+                if self._rollups is None:
+                    self._rollups = ROLLUPS if ROLLUPS.tables == self.tables else Rollups(tables=self.tables, labels=self.labels).follow_writes()
+        return self._rollups
+
+    @property
+    def results_index(self):
+        if self._index is None:
+            from .resultsindex import RESULTS_INDEX, ResultsIndex
+            tables = (self.tables["progress"], self.tables["summary"])
+            with self._lock:
+                if self._index is None:
+                    self._index = RESULTS_INDEX if RESULTS_INDEX.tables == tables else ResultsIndex(tables=tables)
+        return self._index
+
+    def __repr__(self):
+        return f"GameSpec({self.id!r})"
+
+GAMES = {}
+DEFAULT_GAME = "slope_showdown"
+
+def register(game):
+    if game.id in GAMES: raise ValueError(f"game {game.id!r} is already registered")
+    GAMES[game.id] = game
+    if game.renderer is not None: RENDERERS[game.id] = game.renderer
+    return game
+
+def get_game(game=None):
+    if isinstance(game, GameSpec): return game
+    try:
+        return GAMES[game or DEFAULT_GAME]
+    except KeyError:
+        raise ValueError(f"unknown game {game!r}; registered: {sorted(GAMES)}") from None
+
+def all_keys(backend=GRAPH_BACKEND):
+    """Every image any registered game can show, without duplicates (games may share images)."""
+    return list(dict.fromkeys(k for g in GAMES.values() for k in g.keys(backend)))
+
+def _line(m, b):
+    return graph_key("Zero" if m == 0 else "Positive" if m > 0 else "Negative", m=m or None, b=b)[:4]
+
+# ---------------- Slope Showdown ----------------
+SLOPE_SHOWDOWN = register(GameSpec(
+    "slope_showdown", "Slope Showdown", "📈", "Identify Positive/Negative/Zero/Undefined",
+    prompt="What slope type is shown?",
+    params=lambda: [key[:4] for key in param_space()],
+    random_spec=random_spec, answer=lambda spec: spec[0], choices=lambda spec: SLOPE_TYPES, key=spec_key,
+    labels=SLOPE_TYPES, tables={"progress": "progress", "summary": "summary"},
+    page="pages/01_Slope_Showdown.py", tutorial=(ui.TUTORIAL_INTRO, ui.TUTORIAL_HTML)))
+
+# ---------------- Y-Intercept ----------------
+# Same lines as Slope Showdown, so most of its images are already in the cache.
+INTERCEPT_SLOPES = [0] + SLOPES + [-m for m in SLOPES]
+
+def intercept_spec(rng):
+    return (rng.choice(INTERCEPT_SLOPES), rng.choice(LEVELS))
+
+register(GameSpec(
+    "y_intercept", "Y-Intercept", "🎯", "Read where the line crosses the y-axis",
+    prompt="Where does the line cross the y-axis?",
+    params=lambda: [(m, b) for m in INTERCEPT_SLOPES for b in LEVELS],
+    random_spec=intercept_spec, answer=lambda spec: str(spec[1]), choices=lambda spec: [str(b) for b in LEVELS],
+    key=lambda spec, backend: spec_key(_line(*spec), backend),
+    labels=[str(b) for b in LEVELS], page="pages/02_Y_Intercept.py"))
+
+# ---------------- Slope From Two Points ----------------
+# spec = (x1, y1, x2, y2); the line through both points is drawn with the points labelled.
+def _fmt(q):
+    return str(q.numerator) if q.denominator == 1 else f"{q.numerator}/{q.denominator}"
+
+def two_point_answer(spec):
+    x1, y1, x2, y2 = spec
+    return "undefined" if x1 == x2 else _fmt(Fraction(y2 - y1, x2 - x1))
+
+def two_point_choices(spec):
+    # The right slope plus the usual slips: sign flipped, rise/run swapped, off by one.
+    ans = two_point_answer(spec)
+    if ans in ("0", "undefined"): return ["-1", "0", "1", "undefined"]
+    s = Fraction(ans); out = []
+    for c in (s, -s, 1/s, -1/s, s+1, s-1, 2*s):
+        if _fmt(c) not in out: out.append(_fmt(c))
+    return sorted(out[:4], key=Fraction)
+
+def two_point_params():
+    return [(x1, y1, x1 + run, y1 + rise) for x1 in range(-4, 1) for y1 in range(-2, 3)
+            for run in range(0, 5) for rise in range(-3, 4) if run or rise]
+
+def two_point_spec(rng):
+    run, rise = rng.randint(0, 4), rng.randint(-3, 3)
+    if not (run or rise): rise = rng.choice([-3, -2, -1, 1, 2, 3])
+    x1, y1 = rng.randint(-4, 0), rng.randint(-2, 2)
+    return (x1, y1, x1 + run, y1 + rise)
+
+def render_two_points(key):
+    _, x1, y1, x2, y2, style = key
+    if x1 == x2: line = ("Undefined", None, None, x1)
+    else:
+        m = Fraction(y2 - y1, x2 - x1)
+        line = _line(float(m), float(y1 - m * x1))
+    return draw(style, *line, points=((x1, y1), (x2, y2)))
+
+register(GameSpec(
+    "two_point_slope", "Slope From Two Points", "📍", "Rise over run between two plotted points",
+    prompt="What is the slope of the line through the two points?",
+    params=two_point_params, random_spec=two_point_spec, answer=two_point_answer, choices=two_point_choices,
+    key=lambda spec, backend: ("two_point_slope", *spec, BACKEND_STYLES[backend]),
+    renderer=render_two_points, page="pages/03_Two_Point_Slope.py"))
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["warm"]:
+        backend = sys.argv[2] if sys.argv[2:3] else GRAPH_BACKEND
+        if backend not in BACKEND_STYLES: sys.exit(f"usage: python -m mathgames.games warm [{'|'.join(BACKEND_STYLES)}]")
+        n = GRAPHS.warm(all_keys(backend))
+        print(f"warmed {n} graphs into {GRAPHS.cache_dir or '(memory only)'}: {GRAPHS.stats()}")
+    else:
+        for g in GAMES.values():
+            print(f"{g.icon} {g.id:<16} {len(g.params()):>5} questions  {g.title} — {g.blurb}  ({g.page})")
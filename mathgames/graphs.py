@@ -0,0 +1,236 @@
+# Graph rendering + pre-render cache.
+# A question graph is a pure function of (kind, m, b, k, style), and that space is tiny,
+# so every image is rendered at most once per process (or loaded from disk) and shared
+# by all sessions instead of running Matplotlib on every sign-in / "Play Again".
+# Backends: "svg" (default, ~1-2 KB string, no Matplotlib), "canvas" (line spec drawn by
+# the browser, same approach as the tutorial canvas) and "png" (Matplotlib/Agg, for export).
+# Run: python -m mathgames.graphs warm [backend]   (pre-populates the cache before class)
+
+import hashlib, json, os, sys, threading
+from collections import OrderedDict
+from io import BytesIO
+from .metrics import METRICS, timed
+
+SLOPE_TYPES = ["Positive", "Negative", "Zero", "Undefined"]
+SLOPES = [1, 2, 3, 0.5, 2/3, 1.5]                 # |m| for Positive/Negative
+INTERCEPTS = list(range(-2, 3))                   # b for Positive/Negative
+LEVELS = list(range(-4, 5))                       # b for Zero, k for Undefined
+BACKEND_STYLES = {"png": "png-180", "svg": "svg", "canvas": "canvas"}   # png style is "png-<dpi>"
+GRAPH_BACKEND = os.environ.get("SLOPE_GRAPH_BACKEND", "svg")
+DEFAULT_STYLE = BACKEND_STYLES.get(GRAPH_BACKEND, "svg")
+DISK_FORMATS = {"png"}                            # text backends are cheaper to rebuild than to read
+LINE_COLOR = "#1f77b4"
+CACHE_SIZE = int(os.environ.get("SLOPE_GRAPH_CACHE_SIZE", "1024"))      # every game's images, per style
+CACHE_DIR = os.environ.get("SLOPE_GRAPH_CACHE_DIR", ".graph_cache")   # "" disables disk
+
+def graph_key(kind, m=None, b=None, k=None, style=DEFAULT_STYLE):
+    return (kind, m, b, k, style)
+
+def param_space(style=DEFAULT_STYLE):
+    for m in SLOPES:
+        for b in INTERCEPTS:
+            yield graph_key("Positive", m=m, b=b, style=style)
+            yield graph_key("Negative", m=-m, b=b, style=style)
+    for b in LEVELS:
+        yield graph_key("Zero", b=b, style=style)
+    for k in LEVELS:
+        yield graph_key("Undefined", k=k, style=style)
+
+# ---------------- Renderers ----------------
+def render_png(kind, m=None, b=None, k=None, dpi=180, points=()):
+    # Figure + Agg canvas directly (no pyplot): no global figure registry, safe across session threads.
+    import numpy as np
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    fig = Figure(figsize=(4,4)); FigureCanvasAgg(fig); ax = fig.add_subplot()
+    x = np.linspace(-6, 6, 50)
+    if kind == "Undefined": ax.plot([k,k],[-6,6],linewidth=3)
+    elif kind == "Zero": ax.plot(x, np.full_like(x,b), linewidth=3)
+    else: ax.plot(x, m*x+b, linewidth=3)
+    for px, py in points:
+        ax.plot([px], [py], "o", color="black", markersize=7, zorder=3)
+        ax.annotate(f"({px}, {py})", (px, py), textcoords="offset points", xytext=(6, 6), fontsize=9)
+    ax.set_xlim(-6,6); ax.set_ylim(-6,6)
+    ax.axhline(0,color='black',linewidth=1); ax.axvline(0,color='black',linewidth=1)
+    ax.set_xticks(range(-6,7,2)); ax.set_yticks(range(-6,7,2))
+    ax.grid(True, alpha=0.3)
+    buf = BytesIO(); fig.tight_layout(); fig.savefig(buf, format="png", dpi=dpi)
+    return buf.getvalue()
+
+def line_segment(kind, m=None, b=None, k=None, lim=6):
+    """Visible part of the line inside the [-lim, lim] window, as ((x1, y1), (x2, y2))."""
+    if kind == "Undefined": return (k, -lim), (k, lim)
+    if kind == "Zero": return (-lim, b), (lim, b)
+    xa, xb = sorted(((-lim-b)/m, (lim-b)/m))
+    xa, xb = max(xa, -lim), min(xb, lim)
+    return (xa, m*xa+b), (xb, m*xb+b)
+
+def line_spec(kind, m=None, b=None, k=None):
+    (x1, y1), (x2, y2) = line_segment(kind, m, b, k)
+    return {"x1": round(x1, 3), "y1": round(y1, 3), "x2": round(x2, 3), "y2": round(y2, 3)}
+
+def render_svg(kind, m=None, b=None, k=None, size=360, pad=28, points=()):
+    span = size - 2*pad
+    px = lambda v: round(pad + (v+6) / 12 * span, 1)          # math x -> svg x
+    py = lambda v: round(pad + (6-v) / 12 * span, 1)          # math y -> svg y (flipped)
+    grid = "".join(f"M{px(t)} {pad}V{pad+span}M{pad} {py(t)}H{pad+span}" for t in range(-6, 7, 2))
+    labels = "".join(f'<text x="{px(t)}" y="{size-8}">{t}</text><text x="{pad-6}" y="{py(t)+4}" text-anchor="end">{t}</text>'
+                     for t in range(-6, 7, 2))
+    (x1, y1), (x2, y2) = line_segment(kind, m, b, k)
+    dots = "".join(f'<circle cx="{px(x)}" cy="{py(y)}" r="5" fill="#000"/><text x="{px(x)+7}" y="{py(y)-7}">({x}, {y})</text>'
+                   for x, y in points)
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {size} {size}" font-family="sans-serif" font-size="11" fill="#333">'
+            f'<rect x="{pad}" y="{pad}" width="{span}" height="{span}" fill="#fff" stroke="#000" stroke-width=".8"/>'
+            f'<path d="{grid}" stroke="#b0b0b0" stroke-opacity=".6" stroke-width=".8"/>'
+            f'<path d="M{px(0)} {pad}V{pad+span}M{pad} {py(0)}H{pad+span}" stroke="#000"/>'
+            f'<g text-anchor="middle">{labels}</g>'
+            f'<line x1="{px(x1)}" y1="{py(y1)}" x2="{px(x2)}" y2="{py(y2)}" stroke="{LINE_COLOR}" stroke-width="3" stroke-linecap="round"/>'
+            f'{dots}</svg>')
+
+CANVAS_HTML = """<canvas id="g" width="360" height="360" style="max-width:100%"></canvas>
+<script>(function(){const L=__SPEC__,c=document.getElementById('g'),g=c.getContext('2d'),P=28,S=c.width-2*P;
+const X=v=>P+(v+6)/12*S, Y=v=>P+(6-v)/12*S;
+g.font='11px sans-serif'; g.fillStyle='#333'; g.textAlign='center';
+for(let t=-6;t<=6;t+=2){g.strokeStyle='rgba(176,176,176,.6)';g.lineWidth=.8;
+ g.beginPath();g.moveTo(X(t),P);g.lineTo(X(t),P+S);g.moveTo(P,Y(t));g.lineTo(P+S,Y(t));g.stroke();
+ g.fillText(t,X(t),c.height-8); g.textAlign='right'; g.fillText(t,P-6,Y(t)+4); g.textAlign='center';}
+g.strokeStyle='#000'; g.lineWidth=1; g.strokeRect(P,P,S,S);
+g.beginPath();g.moveTo(X(0),P);g.lineTo(X(0),P+S);g.moveTo(P,Y(0));g.lineTo(P+S,Y(0));g.stroke();
+g.strokeStyle='__COLOR__'; g.lineWidth=3; g.lineCap='round';
+g.beginPath();g.moveTo(X(L.x1),Y(L.y1));g.lineTo(X(L.x2),Y(L.y2));g.stroke();
+g.fillStyle='#000'; g.textAlign='left';
+(L.pts||[]).forEach(p=>{g.beginPath();g.arc(X(p[0]),Y(p[1]),5,0,7);g.fill();g.fillText('('+p[0]+', '+p[1]+')',X(p[0])+7,Y(p[1])-7);});})();</script>"""
+
+def render_canvas(kind, m=None, b=None, k=None, points=()):
+    spec = line_spec(kind, m, b, k)
+    if points: spec["pts"] = [list(p) for p in points]
+    return CANVAS_HTML.replace("__SPEC__", json.dumps(spec)).replace("__COLOR__", LINE_COLOR)
+
+def draw(style, kind, m=None, b=None, k=None, points=()):
+    """One line (plus optional labelled points) in the given style: the shared drawing path for every game."""
+    fmt, _, opt = style.partition("-")
+    if fmt == "png": return render_png(kind, m, b, k, dpi=int(opt or 180), points=points)
+    if fmt == "svg": return render_svg(kind, m, b, k, points=points)
+    if fmt == "canvas": return render_canvas(kind, m, b, k, points=points)
+    raise ValueError(f"Unknown graph style: {style!r}")
+
+RENDERERS = {}    # key[0] -> renderer(key), for games whose keys are not plain line keys (mathgames/games.py)
+
+@timed("graph.render")
+def render(key):
+    custom = RENDERERS.get(key[0])
+    if custom is not None: return custom(key)
+    kind, m, b, k, style = key
+    return draw(style, kind, m, b, k)
+
+# ---------------- Cache ----------------
+class GraphCache:
+    """Bounded LRU of rendered graphs, optionally backed by a content-addressed directory."""
+
+    def __init__(self, maxsize=CACHE_SIZE, cache_dir=CACHE_DIR, renderer=render):
+        self.maxsize = maxsize
+        self.cache_dir = cache_dir or None
+        self.renderer = renderer
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self._pending = {}        # key -> [lock, waiters] while that image is being loaded or rendered
+        self._prefetcher = None
+        self.hits = self.misses = self.disk_hits = self.renders = 0
+
+    @staticmethod
+    def digest(key):
+        return hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        fmt = key[-1].partition("-")[0]
+        return os.path.join(self.cache_dir, f"{self.digest(key)}.{fmt}")
+
+    def _lookup(self, key):
+        with self._lock:
+            data = self._items.get(key)
+            if data is not None:
+                self._items.move_to_end(key)
+            return data
+
+    def _store(self, key, data):
+        with self._lock:
+            self._items[key] = data
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def _on_disk(self, key):
+        return self.cache_dir and key[-1].partition("-")[0] in DISK_FORMATS
+
+    def _read_disk(self, key):
+        if not self._on_disk(key): return None
+        try:
+            with open(self._path(key), "rb") as f: return f.read()
+        except OSError:
+            return None
+
+    def _write_disk(self, key, data):
+        if not self._on_disk(key): return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._path(key); tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f: f.write(data)
+            os.replace(tmp, path)
+        except OSError:
+            pass    # disk cache is best-effort; memory cache still works
+
+    def get(self, key):
+        data = self._lookup(key)
+        if data is not None:
+            self.hits += 1; return data
+        # One lock per key: when a whole class starts at once, the first session renders and
+        # everyone else waiting on the same key picks up the result; other keys do not wait.
+        with self._lock:
+            pending = self._pending.setdefault(key, [threading.Lock(), 0]); pending[1] += 1
+        try:
+            with pending[0]:
+                data = self._lookup(key)
+                if data is not None:
+                    self.hits += 1; return data
+                data = self._read_disk(key)
+                if data is None:
+                    data = self.renderer(key)
+                    self._write_disk(key, data)
+                    with self._lock: self.misses += 1; self.renders += 1
+                else:
+                    with self._lock: self.misses += 1; self.disk_hits += 1
+                self._store(key, data)
+                return data
+        finally:
+            with self._lock:
+                pending[1] -= 1
+                if not pending[1]: del self._pending[key]
+
+    def prefetch(self, key):
+        # Render in the background so the next question is ready before the student clicks Next.
+        with self._lock:
+            if key in self._items: return
+            if self._prefetcher is None:
+                from concurrent.futures import ThreadPoolExecutor
+                self._prefetcher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="graph-prefetch")
+        self._prefetcher.submit(self.get, key)
+
+    def warm(self, keys=None):
+        n = 0
+        for key in (param_space() if keys is None else keys):
+            self.get(key); n += 1
+        return n
+
+    def stats(self):
+        return {"size": len(self._items), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses,
+                "disk_hits": self.disk_hits, "renders": self.renders}
+
+# Process-wide instance shared by every session (modules are imported once per server process).
+GRAPHS = GraphCache()
+METRICS.watch("graphs", GRAPHS.stats)
+
+if __name__ == "__main__":
+    if sys.argv[1:2] != ["warm"] or sys.argv[2:3] and sys.argv[2] not in BACKEND_STYLES:
+        sys.exit(f"usage: python -m mathgames.graphs warm [{'|'.join(BACKEND_STYLES)}]")
+    n = GRAPHS.warm(param_space(BACKEND_STYLES[sys.argv[2]]) if sys.argv[2:3] else None)
+    print(f"warmed {n} graphs into {GRAPHS.cache_dir or '(memory only)'}: {GRAPHS.stats()}")
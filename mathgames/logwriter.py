@@ -0,0 +1,124 @@
+# Batched, background logging.
+# log_progress/log_summary only enqueue a row (no lock, no I/O on the click path); one writer
+# thread per process groups queued rows by table and appends them to the storage backend in
+# one call, flushing when BATCH_SIZE rows are waiting or FLUSH_INTERVAL seconds have passed.
+# Rows whose append fails are kept and retried on the next flush, up to MAX_BACKLOG rows (the
+# oldest are dropped beyond that, and counted in stats()).
+
+import atexit, logging, os, queue, threading, time
+from .metrics import METRICS
+
+BATCH_SIZE = int(os.environ.get("SLOPE_LOG_BATCH_SIZE", "50"))
+FLUSH_INTERVAL = float(os.environ.get("SLOPE_LOG_FLUSH_INTERVAL", "0.5"))   # seconds
+MAX_BACKLOG = int(os.environ.get("SLOPE_LOG_MAX_BACKLOG", "100000"))        # failed rows kept for retry
+
+log = logging.getLogger(__name__)
+_STOP = object()
+
+class _Flush:
+    __slots__ = ("done", "ok")
+
+    def __init__(self):
+        self.done, self.ok = threading.Event(), False
+
+def append_to_storage(table, rows):
+    from .storage import get_storage
+    get_storage().append(table, rows)
+
+class BatchedWriter:
+    def __init__(self, sink=append_to_storage, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL, max_backlog=MAX_BACKLOG):
+        self.sink = sink
+        self.listeners = []         # called with the set of tables after each successful flush
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_backlog = max_backlog
+        self._q = queue.SimpleQueue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self.rows_written = self.flushes = self.errors = self.backlog = self.dropped = 0
+        self.last_flush_ms = self.max_flush_ms = self.total_flush_ms = 0.0
+
+    def _ensure_thread(self):
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+                    self._thread.start()
+                    atexit.register(self.close)
+
+    def submit(self, table, row):
+        self._ensure_thread()
+        self._q.put((table, row))
+
+    def flush(self, timeout=5.0):
+        """Block until everything queued before this call is on disk; False if that failed or timed out."""
+        if self._thread is None: return True
+        waiter = _Flush()
+        self._q.put(waiter)
+        return waiter.done.wait(timeout) and waiter.ok
+
+    def close(self, timeout=5.0):
+        if self._thread is None or not self._thread.is_alive(): return
+        self._q.put(_STOP)
+        self._thread.join(timeout)
+
+    def _run(self):
+        pending, waiters, deadline = [], [], None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._q.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            stop = item is _STOP
+            if isinstance(item, _Flush):
+                waiters.append(item)
+            elif item is not None and not stop:
+                pending.append(item)
+                if deadline is None: deadline = time.monotonic() + self.flush_interval
+            if pending and (stop or waiters or item is None or len(pending) >= self.batch_size):
+                pending = self._write(pending)
+                deadline = time.monotonic() + self.flush_interval if pending else None
+            for w in waiters:
+                w.ok = not pending; w.done.set()      # a failed append fails the flush (it is retried later)
+            waiters = []
+            if stop: return
+
+    def _write(self, pending):
+        t0 = time.perf_counter()
+        by_table = {}
+        for table, row in pending:
+            by_table.setdefault(table, []).append(row)
+        failed, written = [], set()
+        for table, rows in by_table.items():
+            try:
+                with METRICS.span(f"log.append.{table}"): self.sink(table, rows)
+                self.rows_written += len(rows); written.add(table)
+            except Exception:
+                self.errors += 1
+                log.exception("Failed to append %d rows to %s; will retry", len(rows), table)
+                failed.extend((table, r) for r in rows)
+        ms = (time.perf_counter() - t0) * 1000
+        self.flushes += 1; self.last_flush_ms = ms; self.total_flush_ms += ms
+        self.max_flush_ms = max(self.max_flush_ms, ms)
+        for fn in (self.listeners if written else ()):
+            try:
+                fn(written)
+            except Exception:
+                log.exception("Log writer listener %r failed", fn)
+        if len(failed) > self.max_backlog:
+            drop = len(failed) - self.max_backlog
+            log.error("Log backlog over %d rows; dropping the %d oldest", self.max_backlog, drop)
+            self.dropped += drop; failed = failed[drop:]
+        self.backlog = len(failed)
+        return failed
+
+    def stats(self):
+        return {"queue_depth": self._q.qsize(), "rows_written": self.rows_written, "flushes": self.flushes,
+                "errors": self.errors, "backlog": self.backlog, "dropped": self.dropped, "last_flush_ms": round(self.last_flush_ms, 3),
+                "avg_flush_ms": round(self.total_flush_ms / self.flushes, 3) if self.flushes else 0.0,
+                "max_flush_ms": round(self.max_flush_ms, 3)}
+
+# One writer per server process, shared by every session.
+LOG_WRITER = BatchedWriter()
+METRICS.watch("log_writer", LOG_WRITER.stats)
@@ -0,0 +1,177 @@
+# Opt-in instrumentation for the hot paths: SLOPE_METRICS=1 turns it on.
+# Off (the default), @timed hands back the undecorated function and span() is a shared no-op, so
+# nothing is measured and nothing is paid. On, every timed call goes into a per-op histogram and
+# into the trace of the current Streamlit rerun (script runs are one per thread), which the admin
+# panel on the page shows next to the process-wide aggregates. Components with their own counters
+# (graph cache hits/misses/renders, log writer queue depth/rows/errors) register a stats() callable
+# with watch(); it is read at export time, so those numbers cost nothing in between.
+# Export: SLOPE_METRICS_PROM=path (Prometheus text, rewritten atomically) and/or
+# SLOPE_METRICS_JSONL=path (one snapshot per line), every SLOPE_METRICS_INTERVAL seconds and at
+# exit; "{pid}" in a path is replaced by the process id.
+
+import atexit, bisect, functools, json, os, threading, time
+
+ENABLED = os.environ.get("SLOPE_METRICS", "").lower() not in ("", "0", "false", "no")
+PROM_PATH = os.environ.get("SLOPE_METRICS_PROM", "")
+JSONL_PATH = os.environ.get("SLOPE_METRICS_JSONL", "")
+EXPORT_INTERVAL = float(os.environ.get("SLOPE_METRICS_INTERVAL", "10"))
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)   # seconds
+
+class Histogram:
+    __slots__ = ("counts", "sum", "count", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)      # last slot is +Inf
+        self.sum, self.count, self.max = 0.0, 0, 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.sum += seconds; self.count += 1; self.max = max(self.max, seconds)
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th observation (the max for the +Inf bucket)."""
+        rank, seen = q * self.count, 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if c and seen >= rank: return BUCKETS[i] if i < len(BUCKETS) else self.max
+        return 0.0
+
+class Span:
+    __slots__ = ("metrics", "name", "t0")
+
+    def __init__(self, metrics, name):
+        self.metrics, self.name, self.t0 = metrics, name, None
+
+    def start(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def stop(self):
+        if self.t0 is None: return 0.0
+        dt = time.perf_counter() - self.t0; self.t0 = None
+        self.metrics.observe(self.name, dt)
+        return dt
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+class _NoSpan:
+    def start(self): return self
+    def stop(self): return 0.0
+    def __enter__(self): return self
+    def __exit__(self, *exc): pass
+
+NO_SPAN = _NoSpan()
+
+class Metrics:
+    def __init__(self, enabled=ENABLED):
+        self.enabled = enabled
+        self.histograms = {}      # op -> Histogram
+        self.sources = {}         # name -> stats() callable, read at export time
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._exporter = None
+
+    # ---------------- Recording ----------------
+    def observe(self, name, seconds):
+        with self._lock:
+            h = self.histograms.get(name)
+            if h is None: h = self.histograms[name] = Histogram()
+            h.observe(seconds)
+        trace = getattr(self._local, "trace", None)
+        if trace is not None: trace.append((name, seconds))
+
+    def watch(self, name, stats):
+        """Export the numbers in stats() (a dict) as slope_stat{source=name, stat=...}."""
+        self.sources[name] = stats
+
+    def span(self, name):
+        return Span(self, name) if self.enabled else NO_SPAN
+
+    def timed(self, name):
+        """Decorator; a no-op unless metrics were enabled when the module was imported."""
+        def wrap(fn):
+            if not self.enabled: return fn
+            @functools.wraps(fn)
+            def timed_fn(*args, **kw):
+                t0 = time.perf_counter()
+                try:
+                    return fn(*args, **kw)
+                finally:
+                    self.observe(name, time.perf_counter() - t0)
+            return timed_fn
+        return wrap
+
+    # ---------------- Per-rerun trace ----------------
+    def begin_rerun(self):
+        self._local.trace = [] if self.enabled else None
+
+    def rerun_trace(self):
+        """[(op, calls, total seconds)] recorded on this thread since begin_rerun, in first-seen order."""
+        out = {}
+        for name, dt in getattr(self._local, "trace", None) or ():
+            calls, total = out.get(name, (0, 0.0)); out[name] = (calls + 1, total + dt)
+        return [(name, calls, total) for name, (calls, total) in out.items()]
+
+    # ---------------- Export ----------------
+    def stats(self):
+        out = {}
+        for name, fn in list(self.sources.items()):
+            try:
+                out[name] = {k: v for k, v in fn().items() if isinstance(v, (int, float))}
+            except Exception:
+                out[name] = {}
+        return out
+
+    def snapshot(self):
+        stats = self.stats()
+        with self._lock:
+            return {
+                "ts": time.time(), "pid": os.getpid(), "stats": stats,
+                "histograms": {n: {"count": h.count, "sum": round(h.sum, 6), "max": round(h.max, 6),
+                                   "p50": h.quantile(.5), "p95": h.quantile(.95), "p99": h.quantile(.99),
+                                   "buckets": list(h.counts)} for n, h in self.histograms.items()},
+            }
+
+    def prometheus(self):
+        stats = self.stats()
+        lines = ["# HELP slope_op_seconds Time spent in instrumented operations.", "# TYPE slope_op_seconds histogram"]
+        with self._lock:
+            for name, h in sorted(self.histograms.items()):
+                cum = 0
+                for le, c in zip([*map(repr, BUCKETS), "+Inf"], h.counts):
+                    cum += c; lines.append(f'slope_op_seconds_bucket{{op="{name}",le="{le}"}} {cum}')
+                lines.append(f'slope_op_seconds_sum{{op="{name}"}} {h.sum:.6f}')
+                lines.append(f'slope_op_seconds_count{{op="{name}"}} {h.count}')
+        if stats:
+            lines += ["# HELP slope_stat Graph cache and log writer counters, read at export time.", "# TYPE slope_stat gauge"]
+            lines += [f'slope_stat{{source="{src}",stat="{k}"}} {v}' for src, kv in sorted(stats.items()) for k, v in sorted(kv.items())]
+        return "\n".join(lines) + "\n"
+
+    def dump(self, prom_path=PROM_PATH, jsonl_path=JSONL_PATH):
+        if prom_path:
+            path = prom_path.replace("{pid}", str(os.getpid())); tmp = f"{path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f: f.write(self.prometheus())
+            os.replace(tmp, path)                  # scrapers never see a half-written file
+        if jsonl_path:
+            with open(jsonl_path.replace("{pid}", str(os.getpid())), "a", encoding="utf-8") as f:
+                f.write(json.dumps(self.snapshot()) + "\n")
+
+    def start_exporter(self, interval=EXPORT_INTERVAL):
+        if self._exporter is not None or not (self.enabled and (PROM_PATH or JSONL_PATH)): return
+        def run():
+            while True:
+                time.sleep(interval); self.dump()
+        self._exporter = threading.Thread(target=run, name="slope-metrics", daemon=True)
+        self._exporter.start()
+        atexit.register(self.dump)
+
+    def reset(self):
+        with self._lock: self.histograms.clear()
+
+METRICS = Metrics()
+METRICS.start_exporter()
+timed = METRICS.timed
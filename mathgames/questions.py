@@ -0,0 +1,102 @@
+# Questions: random specs + a lazy, seeded question stream, for any game in the registry
+# (mathgames/games.py; Slope Showdown when no game is given). For Slope Showdown a spec is the
+# tuple (kind, m, b, k); whatever the game, the image comes from the shared graph cache, so a
+# session only ever holds a seed, never a list of rendered images.
+# Question i of a game is a pure function of (seed, i): every game owns its RNGs and never
+# touches the process-global random state that concurrent sessions share.
+
+import functools, hashlib, random
+from .metrics import timed
+from .graphs import GRAPHS, SLOPES, SLOPE_TYPES, BACKEND_STYLES, GRAPH_BACKEND, graph_key
+
+def derive_seed(*parts):
+    """Stable 64-bit seed from e.g. (session_id, game_no) or ("assignment", code)."""
+    return int.from_bytes(hashlib.sha256(":".join(map(str, parts)).encode("utf-8")).digest()[:8], "big")
+
+def random_spec(rng):
+    kind = rng.choice(SLOPE_TYPES)
+    m = b = k = None
+    if kind == "Undefined":
+        k = rng.randint(-4,4)
+    elif kind == "Zero":
+        b = rng.randint(-4,4)
+    else:
+        m = rng.choice(SLOPES); m = m if kind=="Positive" else -m
+        b = rng.randint(-2,2)
+    return (kind, m, b, k)
+
+def spec_key(spec, backend=GRAPH_BACKEND):
+    return graph_key(*spec, style=BACKEND_STYLES[backend])
+
+def _game(game):
+    if game is not None: return game
+    from .games import get_game          # imported here: the registry builds on this module
+    return get_game()
+
+class Question:
+    __slots__ = ("spec", "backend", "answer", "choices", "game")
+
+    def __init__(self, spec, backend=GRAPH_BACKEND, game=None):
+        self.game = _game(game)
+        self.spec, self.backend = spec, backend
+        self.answer, self.choices = self.game.answer(spec), self.game.choices(spec)
+
+    @property
+    def image(self):
+        # Looked up on access, so building a Question never renders anything.
+        return GRAPHS.get(self.game.key(self.spec, self.backend))
+
+    def image_for(self, backend):
+        return GRAPHS.get(self.game.key(self.spec, backend))
+
+    def __repr__(self):
+        return f"Question({self.spec!r}, backend={self.backend!r}, game={self.game.id!r})"
+
+def make_question(spec, backend=GRAPH_BACKEND, game=None):
+    return Question(spec, backend, game)
+
+def spec_at(seed, index, game=None):
+    return _game(game).random_spec(random.Random(derive_seed(seed, index)))
+
+class QuestionStream:
+    """Sequence of n questions for one seed, generated only when indexed.
+
+    Question i is spec_at(seed, i), so a game replays exactly from its seed, any question can be
+    rebuilt on its own, and the stream has no mutable state (one instance can serve a whole
+    class). Indexing question i optionally prefetches the image for i+1 in the background.
+    """
+
+    def __init__(self, n, seed=None, backend=GRAPH_BACKEND, prefetch=True, game=None):
+        self.n, self.game = n, _game(game)
+        self.seed = random.SystemRandom().getrandbits(64) if seed is None else seed
+        self.backend = backend
+        self.prefetch = prefetch
+
+    def __len__(self):
+        return self.n
+
+    def spec(self, i):
+        if not 0 <= i < self.n: raise IndexError(i)
+        return spec_at(self.seed, i, self.game)
+
+    @timed("generate_question")           # every question the page, engine and bench show
+    def __getitem__(self, i):
+        q = make_question(self.spec(i), self.backend, self.game)
+        if self.prefetch and i+1 < self.n:
+            GRAPHS.prefetch(self.game.key(self.spec(i+1), self.backend))
+        return q
+
+    def __iter__(self):
+        for i in range(self.n): yield self[i]
+
+@timed("build_graph_set")
+def build_graph_set(n, seed=None, backend=GRAPH_BACKEND, prefetch=True, game=None):
+    return QuestionStream(n, seed=seed, backend=backend, prefetch=prefetch, game=game)
+
+@functools.lru_cache(maxsize=64)
+def assignment_set(code, n, backend=GRAPH_BACKEND, game=None):
+    """One shared question set per assignment code (and game); its images are pre-rendered into the cache."""
+    stream = QuestionStream(n, seed=derive_seed("assignment", code), backend=backend, game=game)
+    for i in range(n):
+        GRAPHS.prefetch(stream.game.key(stream.spec(i), backend))
+    return stream
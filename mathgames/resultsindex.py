@@ -0,0 +1,214 @@
+# Prebuilt indexes behind the Results browser, so filtering and paging through all history stays
+# in the low milliseconds at millions of rows instead of rescanning the log on every rerun.
+# Like the rollups, each table is followed with a storage cursor and only new rows get indexed:
+#   - row position -> storage key (CSV row number / SQLite id); a page fetches just its rows
+#   - class period -> positions
+#   - distinct name -> positions, plus a trigram index over the lower-cased names for substring search
+#   - won games (summary tables) -> positions, for the winner count under the same filters
+#   - timestamps (epoch seconds) for date ranges: pure bisection while the log is in time order,
+#     bisection plus a vectorised check of the tail once several workers have interleaved batches
+# Positions are sorted int64 arrays; filters combine by intersecting them.
+
+import threading
+from .metrics import timed
+
+PAGE_SIZES = [50, 100, 500]
+
+def _epoch(values):
+    """Naive ISO timestamps/dates -> int64 seconds (unparseable -> int64 min)."""
+    import numpy as np, pandas as pd
+    t = pd.to_datetime(pd.Series(values, dtype=object), errors="coerce", format="ISO8601")
+    return t.to_numpy(dtype="datetime64[s]").astype(np.int64)
+
+def _labels(series, default):
+    return series.astype(object).where(series.notna(), default).astype(str).to_numpy()
+
+def _grams(text):
+    return {text[i:i+3] for i in range(len(text) - 2)}
+
+def _intersect(a, b):
+    import numpy as np
+    if len(a) > len(b): a, b = b, a
+    if not len(a): return a
+    if len(a) * 16 < len(b):                       # small vs large: binary-search the small side
+        i = np.minimum(np.searchsorted(b, a), len(b) - 1)
+        return a[b[i] == a]
+    mask = np.zeros(max(a[-1], b[-1]) + 1, dtype=bool); mask[b] = True
+    return a[mask[a]]
+
+def _union(parts, n):
+    import numpy as np
+    if len(parts) == 1: return parts[0]
+    mask = np.zeros(n, dtype=bool)
+    for p in parts: mask[p] = True
+    return np.flatnonzero(mask)
+
+class _Vec:
+    """Growable int64 array. Views handed out stay valid while it grows."""
+    __slots__ = ("data", "n")
+
+    def __init__(self):
+        self.data, self.n = None, 0      # allocated on first use: importing this module stays NumPy-free
+
+    def extend(self, values):
+        import numpy as np
+        k, size = len(values), 0 if self.data is None else len(self.data)
+        if not k: return
+        if self.n + k > size:
+            grown = np.empty(max(2 * size, 64, self.n + k), dtype=np.int64)
+            if self.n: grown[:self.n] = self.data[:self.n]
+            self.data = grown
+        self.data[self.n:self.n + k] = values; self.n += k
+
+    def view(self):
+        if self.data is None:
+            import numpy as np
+            self.data = np.empty(64, dtype=np.int64)
+        return self.data[:self.n]
+
+class TableIndex:
+    def __init__(self):
+        self.keys, self.ts, self.ts_max = _Vec(), _Vec(), _Vec()
+        self.in_order = True      # timestamps never go backwards (so far)
+        self.by_period = {}       # period -> positions
+        self.name_ids = {}        # name -> id
+        self.names = []           # id -> lower-cased name
+        self.by_name = []         # id -> positions
+        self.grams = {}           # trigram -> set of name ids
+        self.won = _Vec()         # positions of won games (tables with a `won` column)
+        self.cursor = 0
+
+    def __len__(self):
+        return self.keys.n
+
+    def add(self, df):
+        import numpy as np, pandas as pd
+        n0, k = self.keys.n, len(df)
+        if not k: return
+        self.keys.extend(df.index.to_numpy(dtype=np.int64))
+        ts = _epoch(df["timestamp"])
+        if self.in_order and ((n0 and ts[0] < self.ts.view()[-1]) or (np.diff(ts) < 0).any()):
+            self.in_order = False
+        prev = self.ts_max.view()[-1] if n0 else np.iinfo(np.int64).min
+        self.ts.extend(ts); self.ts_max.extend(np.maximum.accumulate(np.maximum(ts, prev)))
+        rows = pd.Series(np.arange(n0, n0 + k))
+        for period, idx in rows.groupby(_labels(df["class_period"], "unknown"), sort=False).indices.items():
+            self.by_period.setdefault(period, _Vec()).extend(n0 + idx)
+        for name, idx in rows.groupby(_labels(df["name"], ""), sort=False).indices.items():
+            i = self.name_ids.get(name)
+            if i is None:
+                i = self.name_ids[name] = len(self.names)
+                self.names.append(name.lower()); self.by_name.append(_Vec())
+                for g in _grams(name.lower()): self.grams.setdefault(g, set()).add(i)
+            self.by_name[i].extend(n0 + idx)
+        if "won" in df.columns:
+            self.won.extend(n0 + np.flatnonzero(pd.to_numeric(df["won"], errors="coerce").to_numpy() == 1))
+
+    def match_names(self, text):
+        """Ids of the names containing text, case-insensitively."""
+        q = text.lower()
+        if len(q) < 3:
+            ids = range(len(self.names))
+        else:
+            sets = sorted((self.grams.get(g, set()) for g in _grams(q)), key=len)
+            ids = sets[0].intersection(*sets[1:])
+        return [i for i in ids if q in self.names[i]]
+
+    def _in_range(self, hits, since, until):
+        import numpy as np
+        n, ts = self.keys.n, self.ts.view()
+        lo = _epoch([since])[0] if since is not None else None
+        hi = _epoch([until])[0] if until is not None else None
+        # Every row before `start` is older than `since`, even when batches arrived out of order.
+        start = int(np.searchsorted(self.ts_max.view(), lo, "left")) if lo is not None else 0
+        if self.in_order:
+            stop = int(np.searchsorted(ts, hi, "left")) if hi is not None else n
+            if hits is None: return np.arange(start, max(start, stop))
+            return hits[np.searchsorted(hits, start):np.searchsorted(hits, stop)]
+        cand = np.arange(start, n) if hits is None else hits[np.searchsorted(hits, start):]
+        t, keep = ts[cand], np.ones(len(cand), dtype=bool)
+        if lo is not None: keep &= t >= lo
+        if hi is not None: keep &= t < hi
+        return cand[keep]
+
+    def search(self, name=None, period=None, since=None, until=None):
+        """Sorted positions matching every filter given (None = all rows). `until` is exclusive."""
+        import numpy as np
+        hits = None
+        if period:
+            v = self.by_period.get(period)
+            hits = v.view() if v else np.empty(0, dtype=np.int64)
+        if name:
+            parts = [self.by_name[i].view() for i in self.match_names(name)]
+            sel = _union(parts, self.keys.n) if parts else np.empty(0, dtype=np.int64)
+            hits = sel if hits is None else _intersect(hits, sel)
+        if since is not None or until is not None:
+            hits = self._in_range(hits, since, until)
+        return hits
+
+class ResultsIndex:
+    def __init__(self, storage=None, tables=("progress", "summary")):
+        self._storage = storage
+        self.tables = tables
+        self._lock = threading.Lock()
+        self._reset()
+
+    @property
+    def storage(self):
+        if self._storage is None:
+            from .storage import get_storage
+            self._storage = get_storage()
+        return self._storage
+
+    def _reset(self):
+        self.index = {t: TableIndex() for t in self.tables}
+
+    @timed("results.catch_up")
+    def catch_up(self):
+        """Index rows appended since the last call; O(new rows)."""
+        with self._lock:
+            for table, ix in self.index.items():
+                rows, cursor = self.storage.rows_since(table, ix.cursor)
+                if cursor < ix.cursor:                     # log truncated or replaced: start over
+                    ix = self.index[table] = TableIndex()
+                    rows, cursor = self.storage.rows_since(table, 0)
+                ix.add(rows); ix.cursor = cursor
+        return self
+
+    def rebuild(self):
+        with self._lock: self._reset()
+        return self.catch_up()
+
+    # ---------------- Read side ----------------
+    def total(self, table):
+        return len(self.index[table])
+
+    def periods(self, table):
+        with self._lock:
+            return sorted(self.index[table].by_period)
+
+    def count(self, table, **filters):
+        with self._lock:
+            ix = self.index[table]; hits = ix.search(**filters)
+            return len(ix) if hits is None else len(hits)
+
+    def wins(self, table, **filters):
+        """Won games among the rows matching the filters (the count() rows)."""
+        with self._lock:
+            ix = self.index[table]; hits = ix.search(**filters); won = ix.won.view()
+            return len(won) if hits is None else len(_intersect(hits, won))
+
+    @timed("results.page")
+    def page(self, table, page=0, size=100, newest_first=True, **filters):
+        """(rows on page `page`, number of matching rows). Filters: name, period, since, until."""
+        with self._lock:
+            ix = self.index[table]; hits = ix.search(**filters)
+            total = len(ix) if hits is None else len(hits)
+            start = page * size
+            lo, hi = (max(0, total - start - size), max(0, total - start)) if newest_first else (min(start, total), min(start + size, total))
+            picked = slice(lo, hi) if hits is None else hits[lo:hi]
+            keys = ix.keys.view()[picked]
+        rows = self.storage.rows_at(table, keys)
+        return (rows.iloc[::-1] if newest_first else rows), total
+
+RESULTS_INDEX = ResultsIndex()
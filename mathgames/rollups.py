@@ -0,0 +1,142 @@
+# Pre-aggregated teacher analytics, per class period and per student (one Rollups per game;
+# ROLLUPS is Slope Showdown's, the registry in mathgames/games.py creates the others).
+# Rollups follow a cursor into each storage table: every flush of the log writer folds in just the
+# rows it appended (or any other process appended), so the Results dashboard reads ready-made
+# numbers instead of rescanning history on every rerun.
+# Run: python -m mathgames.rollups rebuild [out.json]   (recompute every game's rollups from the logs)
+
+import json, sys, threading
+from .graphs import SLOPE_TYPES
+from .logwriter import LOG_WRITER
+from .metrics import timed
+
+def _int(v):
+    try:
+        return int(v)
+    except (TypeError, ValueError):
+        return 0
+
+def _str(v, default=""):
+    return default if v is None or v != v else str(v)     # v != v catches NaN/NA
+
+def _blank(labels=()):
+    return {"answers": 0, "correct": 0, "by_type": {t: [0, 0] for t in labels},
+            "confusion": {}, "games": 0, "wins": 0, "score_sum": 0, "best_streak": 0}
+
+class Rollups:
+    def __init__(self, storage=None, tables=None, labels=SLOPE_TYPES):
+        self._storage = storage
+        self.tables = tables or {"progress": "progress", "summary": "summary"}
+        self.labels = list(labels or ())      # answer types with their own accuracy column; [] for open-ended answers
+        self._lock = threading.Lock()
+        self._reset()
+
+    @property
+    def storage(self):
+        if self._storage is None:
+            from .storage import get_storage
+            self._storage = get_storage()
+        return self._storage
+
+    def _reset(self):
+        self.periods = {}       # period -> stats
+        self.students = {}      # (period, name) -> stats
+        self.cursors = {"progress": 0, "summary": 0}
+
+    def _groups(self, period, name):
+        p = self.periods.get(period)
+        if p is None: p = self.periods[period] = _blank(self.labels)
+        s = self.students.get((period, name))
+        if s is None: s = self.students[(period, name)] = _blank(self.labels)
+        return p, s
+
+    def _add_progress(self, df):
+        for period, name, choice, answer, correct, best in zip(
+                df["class_period"], df["name"], df["choice"], df["answer"], df["correct"], df["best_streak"]):
+            period, name, choice, answer, ok = _str(period, "unknown"), _str(name), _str(choice), _str(answer), _int(correct)
+            for g in self._groups(period, name):
+                g["answers"] += 1; g["correct"] += ok
+                if answer in g["by_type"]:
+                    g["by_type"][answer][0] += 1; g["by_type"][answer][1] += ok
+                g["confusion"][(choice, answer)] = g["confusion"].get((choice, answer), 0) + 1
+                g["best_streak"] = max(g["best_streak"], _int(best))
+
+    def _add_summary(self, df):
+        for period, name, score, best, won in zip(df["class_period"], df["name"], df["score"], df["best_streak"], df["won"]):
+            period, name = _str(period, "unknown"), _str(name)
+            for g in self._groups(period, name):
+                g["games"] += 1; g["wins"] += _int(won); g["score_sum"] += _int(score)
+                g["best_streak"] = max(g["best_streak"], _int(best))
+
+    @timed("rollups.catch_up")
+    def catch_up(self, tables=None):
+        """Fold in rows appended since the last call; O(new rows)."""
+        with self._lock:
+            for kind, add in (("progress", self._add_progress), ("summary", self._add_summary)):
+                if tables is not None and self.tables[kind] not in tables: continue
+                rows, cursor = self.storage.rows_since(self.tables[kind], self.cursors[kind])
+                if cursor < self.cursors[kind]:            # log truncated or replaced: start over
+                    self._reset(); break
+                add(rows); self.cursors[kind] = cursor
+            else:
+                return self
+        return self.catch_up()
+
+    def rebuild(self):
+        with self._lock: self._reset()
+        return self.catch_up()
+
+    # ---------------- Read side ----------------
+    @staticmethod
+    def row(g):
+        r = {"answers": g["answers"], "accuracy": round(g["correct"] / g["answers"], 3) if g["answers"] else None}
+        for t, (n, ok) in g["by_type"].items():
+            r[f"acc_{t.lower()}"] = round(ok / n, 3) if n else None
+        r.update(games=g["games"], wins=g["wins"], win_rate=round(g["wins"] / g["games"], 3) if g["games"] else None,
+                 avg_score=round(g["score_sum"] / g["games"], 2) if g["games"] else None, best_streak=g["best_streak"])
+        return r
+
+    def period_rows(self):
+        with self._lock:
+            return [{"class_period": p, **self.row(g)} for p, g in sorted(self.periods.items())]
+
+    def student_rows(self, period=None):
+        with self._lock:
+            return [{"class_period": p, "name": n, **self.row(g)} for (p, n), g in sorted(self.students.items())
+                    if period is None or p == period]
+
+    def totals(self, period=None):
+        with self._lock:
+            groups = self.periods.values() if period is None else [self.periods.get(period, _blank())]
+            return {"games": sum(g["games"] for g in groups), "wins": sum(g["wins"] for g in groups)}
+
+    def confusion(self, period, name=None):
+        """{choice: {answer: count}} for a student, or for the whole period when name is None."""
+        with self._lock:
+            g = self.periods.get(period) if name is None else self.students.get((period, name))
+            seen = (g or _blank())["confusion"]
+            labels = self.labels or sorted({a for _, a in seen} | {c for c, _ in seen if c})
+            out = {c: {a: 0 for a in labels} for c in labels}
+            for (choice, answer), n in seen.items():
+                out.setdefault(choice or "(none)", {a: 0 for a in labels})[answer] = n
+            return out
+
+    def to_json(self):
+        return {"periods": self.period_rows(), "students": self.student_rows(), "cursors": dict(self.cursors)}
+
+    def follow_writes(self):
+        """Catch up after every log writer flush that touched this game's tables."""
+        LOG_WRITER.listeners.append(self.catch_up)
+        return self
+
+ROLLUPS = Rollups().follow_writes()          # keep rollups current as the writer appends
+
+if __name__ == "__main__":
+    if sys.argv[1:2] != ["rebuild"]:
+        sys.exit("usage: python -m mathgames.rollups rebuild [out.json]")
+    from mathgames.games import GAMES      # every game's rollups (Slope Showdown's is ROLLUPS)
+    out = json.dumps({g.id: g.rollups.rebuild().to_json() for g in GAMES.values()}, indent=2, default=str)
+    if sys.argv[2:3]:
+        with open(sys.argv[2], "w", encoding="utf-8") as f: f.write(out)
+    else:
+        print(out)
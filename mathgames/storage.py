@@ -0,0 +1,300 @@
+# Storage backends for progress/summary records.
+# "csv" (default) keeps the original append-only files; "sqlite" stores both tables in one
+# WAL-mode database with indexes on class_period, name, session_id and timestamp, so the
+# Results page can filter and page through history without re-parsing every row.
+# Pick with SLOPE_STORAGE=csv|sqlite (database path: SLOPE_DB).
+# Run: python -m mathgames.storage import [--force]   (one-shot copy of every game's CSVs into SQLite;
+#      tables that already have rows are skipped, --force replaces their rows with the CSV's)
+
+import csv, io, os, sqlite3, sys, threading
+from .csvtail import load_csv_cached
+from .metrics import timed
+
+try:
+    import fcntl                                  # POSIX: serialise appends across server processes
+except ImportError:                               # Windows: single-process only
+    fcntl = None
+
+PROGRESS_CSV = "slope_showdown_progress.csv"     # per-question log
+SUMMARY_CSV  = "slope_showdown_results.csv"      # final summary per game
+SQLITE_DB    = os.environ.get("SLOPE_DB", "slope_showdown.db")
+
+# ---------------- Schemas ----------------
+PROGRESS_COLS = ["timestamp","session_id","name","class_period","q_index","total_questions","choice","answer","correct","score_after","streak_after","best_streak"]
+PROGRESS_OLD_COLS = ["timestamp","session_id","name","q_index","total_questions","choice","answer","correct","score_after","streak_after","best_streak"]
+SUMMARY_COLS = ["timestamp","session_id","name","class_period","score","best_streak","total_questions","won"]
+SUMMARY_OLD_COLS = ["timestamp","session_id","name","score","best_streak","total_questions","won"]
+TEXT_COLS = {"timestamp","session_id","name","class_period","choice","answer"}
+
+TABLES = {    # Slope Showdown's; other games add theirs with register_tables()
+    "progress": {"cols": PROGRESS_COLS, "old_cols": PROGRESS_OLD_COLS, "csv": PROGRESS_CSV},
+    "summary":  {"cols": SUMMARY_COLS,  "old_cols": SUMMARY_OLD_COLS,  "csv": SUMMARY_CSV},
+}
+
+def register_tables(prefix):
+    """Progress/summary tables for another game: <prefix>_progress / <prefix>_summary, same columns."""
+    names = {"progress": f"{prefix}_progress", "summary": f"{prefix}_summary"}
+    TABLES.setdefault(names["progress"], {**TABLES["progress"], "csv": f"{prefix}_progress.csv"})
+    TABLES.setdefault(names["summary"], {**TABLES["summary"], "csv": f"{prefix}_results.csv"})
+    return names
+INDEXED_COLS = ["class_period", "name", "session_id", "timestamp"]
+CHUNK_ROWS = int(os.environ.get("SLOPE_EXPORT_CHUNK_ROWS", "50000"))
+
+def project(table, columns=None):
+    """Validated column list for a table (all columns by default)."""
+    cols = TABLES[table]["cols"]
+    if not columns: return list(cols)
+    unknown = [c for c in columns if c not in cols]
+    if unknown: raise ValueError(f"unknown {table} columns: {unknown}")
+    return list(columns)
+
+def _iso(v):
+    # Timestamps are naive ISO strings, so date ranges are plain string comparisons.
+    return v.isoformat() if hasattr(v, "isoformat") else str(v)
+
+# ---------------- Robust CSV loaders ----------------
+@timed("load_csv_flex")
+def load_csv_flex(path, cols, old_cols, insert_index=3, fill_value="unknown"):
+    import pandas as pd
+    if not os.path.exists(path): return None
+    try:
+        df = pd.read_csv(path, dtype=str)
+        if all(c in df.columns for c in cols): return df[cols]
+        if all(c in df.columns for c in old_cols):
+            df.insert(insert_index, cols[insert_index], fill_value)
+            return df[cols]
+        raise ValueError("Mismatched columns")
+    except Exception:
+        rows = []
+        with open(path, newline="", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            for row in reader:
+                if len(row) == len(cols)-1: row.insert(insert_index, fill_value)
+                elif len(row) > len(cols): row = row[:len(cols)]
+                elif len(row) < len(cols): row += [""]*(len(cols)-len(row))
+                rows.append(row)
+        return pd.DataFrame(rows, columns=cols)
+
+def append_csv_rows(path, header, rows):
+    # The whole batch is one locked append, and the empty-file check happens under the lock,
+    # so several workers can share a file without interleaved lines or a second header.
+    buf = io.StringIO(); csv.writer(buf).writerows(rows)
+    with open(path, "a", newline="", encoding="utf-8") as f:
+        if fcntl: fcntl.flock(f.fileno(), fcntl.LOCK_EX)      # released when the file closes
+        if os.fstat(f.fileno()).st_size == 0:
+            csv.writer(f).writerow(header)
+        f.write(buf.getvalue()); f.flush()
+
+# ---------------- Backends ----------------
+class CsvStorage:
+    name = "csv"
+
+    def __init__(self, paths=None):
+        self.paths = paths or {}          # table -> file, overriding TABLES[table]["csv"]
+
+    def path(self, table):
+        return self.paths.get(table) or TABLES[table]["csv"]
+
+    def append(self, table, rows):
+        append_csv_rows(self.path(table), TABLES[table]["cols"], rows)
+
+    def frame(self, table):
+        # Cached, incrementally refreshed frame (mathgames/csvtail.py); shared, so never mutate it.
+        return load_csv_cached(self.path(table), TABLES[table]["cols"], insert_index=3, fill_value="unknown")
+
+    @staticmethod
+    def _mask(df, name, period, since=None, until=None):
+        masks = []
+        if name: masks.append(df["name"].str.lower().str.contains(name.lower(), na=False, regex=False))
+        if period: masks.append(df["class_period"] == period)
+        if since is not None: masks.append(df["timestamp"] >= _iso(since))
+        if until is not None: masks.append(df["timestamp"] < _iso(until))
+        mask = masks[0] if masks else None
+        for m in masks[1:]: mask = mask & m
+        return mask
+
+    def query(self, table, name=None, period=None, limit=None, offset=0, newest_first=False, since=None, until=None):
+        df = self.frame(table)
+        if df is None: df = _empty_frame(table)
+        mask = self._mask(df, name, period, since, until)
+        if mask is not None: df = df[mask]
+        if newest_first: df = df.iloc[::-1]
+        return df.iloc[offset:offset+limit if limit is not None else None]
+
+    def chunks(self, table, columns=None, name=None, period=None, chunk_rows=CHUNK_ROWS, since=None, until=None):
+        """Matching rows, oldest first, as frames of at most chunk_rows rows holding only `columns`."""
+        df = self.frame(table)
+        if df is None: return
+        col_idx = [df.columns.get_loc(c) for c in project(table, columns)]
+        mask = self._mask(df, name, period, since, until)
+        rows = mask.to_numpy(dtype=bool).nonzero()[0] if mask is not None else None
+        n = len(df) if rows is None else len(rows)
+        for start in range(0, n, chunk_rows):
+            pick = slice(start, start + chunk_rows) if rows is None else rows[start:start + chunk_rows]
+            yield df.iloc[pick, col_idx]
+
+    def count(self, table, name=None, period=None, since=None, until=None):
+        return len(self.query(table, name=name, period=period, since=since, until=until))
+
+    def periods(self, table):
+        df = self.frame(table)
+        return [] if df is None else sorted(df["class_period"].dropna().unique().tolist())
+
+    def rows_since(self, table, cursor=0):
+        """Rows appended after cursor (a row count here) and the new cursor."""
+        df = self.frame(table)
+        if df is None: return _empty_frame(table), 0
+        return df.iloc[cursor:], len(df)
+
+    def rows_at(self, table, keys):
+        """Rows by key (the frame index that rows_since returned), in the order given."""
+        df = self.frame(table)
+        if df is None: return _empty_frame(table)
+        import numpy as np
+        if len(keys) and (np.diff(keys) == 1).all():
+            return df.iloc[keys[0]:keys[-1] + 1]          # an unfiltered page: a plain slice
+        return df.iloc[list(keys)]
+
+class SqliteStorage:
+    name = "sqlite"
+
+    def __init__(self, path=SQLITE_DB):
+        self.path = path
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._created = set()             # tables known to exist; games can register more later
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)   # autocommit; explicit BEGIN for batches
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            # str.lower, as the Results index matches names; SQLite's LIKE folds ASCII only (émile != Émile)
+            conn.create_function("py_lower", 1, lambda s: s.lower() if isinstance(s, str) else s, deterministic=True)
+            self._local.conn = conn
+        if len(self._created) != len(TABLES): self._create(conn)
+        return conn
+
+    def _create(self, conn):
+        with self._init_lock:
+            for table, spec in TABLES.items():
+                if table in self._created: continue
+                cols = ", ".join(f"{c} {'TEXT' if c in TEXT_COLS else 'INTEGER'}" for c in spec["cols"])
+                conn.execute(f"CREATE TABLE IF NOT EXISTS {table} (id INTEGER PRIMARY KEY, {cols})")
+                for c in INDEXED_COLS:
+                    conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_{c} ON {table} ({c})")
+                self._created.add(table)
+
+    def append(self, table, rows, replace=False):
+        """Insert rows in one transaction; replace=True first deletes the table's rows in the same one."""
+        cols = TABLES[table]["cols"]
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if replace: conn.execute(f"DELETE FROM {table}")
+            conn.executemany(f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({', '.join('?'*len(cols))})", rows)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK"); raise
+
+    @staticmethod
+    def _where(name, period, since=None, until=None):
+        clauses, args = [], []
+        if name:
+            clauses.append("instr(py_lower(name), ?) > 0"); args.append(name.lower())
+        if period:
+            clauses.append("class_period = ?"); args.append(period)
+        if since is not None:
+            clauses.append("timestamp >= ?"); args.append(_iso(since))
+        if until is not None:
+            clauses.append("timestamp < ?"); args.append(_iso(until))
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), args
+
+    def query(self, table, name=None, period=None, limit=None, offset=0, newest_first=False, since=None, until=None):
+        import pandas as pd
+        where, args = self._where(name, period, since, until)
+        sql = (f"SELECT {', '.join(TABLES[table]['cols'])} FROM {table}{where} "
+               f"ORDER BY id {'DESC' if newest_first else 'ASC'} LIMIT ? OFFSET ?")
+        return pd.read_sql_query(sql, self._conn(), params=args + [-1 if limit is None else limit, offset])
+
+    def frame(self, table):
+        return self.query(table)
+
+    def chunks(self, table, columns=None, name=None, period=None, chunk_rows=CHUNK_ROWS, since=None, until=None):
+        """Matching rows, oldest first, fetched chunk_rows at a time with only `columns` selected."""
+        import pandas as pd
+        where, args = self._where(name, period, since, until)
+        sql = f"SELECT {', '.join(project(table, columns))} FROM {table}{where} ORDER BY id"
+        yield from pd.read_sql_query(sql, self._conn(), params=args, chunksize=chunk_rows)
+
+    def count(self, table, name=None, period=None, since=None, until=None):
+        where, args = self._where(name, period, since, until)
+        return self._conn().execute(f"SELECT COUNT(*) FROM {table}{where}", args).fetchone()[0]
+
+    def periods(self, table):
+        rows = self._conn().execute(f"SELECT DISTINCT class_period FROM {table} WHERE class_period IS NOT NULL ORDER BY class_period")
+        return [r[0] for r in rows]
+
+    def rows_since(self, table, cursor=0):
+        """Rows appended after cursor (the last seen id here, also the frame index) and the new cursor."""
+        import pandas as pd
+        df = pd.read_sql_query(f"SELECT id, {', '.join(TABLES[table]['cols'])} FROM {table} WHERE id > ? ORDER BY id",
+                               self._conn(), params=[cursor], index_col="id")
+        if df.empty:
+            last = self._conn().execute(f"SELECT MAX(id) FROM {table}").fetchone()[0] or 0
+            return df, min(cursor, last)      # table shrank/recreated -> cursor moves back
+        return df, int(df.index[-1])
+
+    def rows_at(self, table, keys):
+        """Rows by id, in the order given."""
+        import pandas as pd
+        keys = [int(k) for k in keys]
+        df = pd.read_sql_query(f"SELECT id, {', '.join(TABLES[table]['cols'])} FROM {table} WHERE id IN ({', '.join('?'*len(keys))})",
+                               self._conn(), params=keys, index_col="id")
+        return df.reindex(keys)
+
+    def import_csv(self, table, path=None, force=False):
+        """Copy an old- or new-layout CSV into the table; skipped if the table already has rows,
+        unless force, which replaces them with the CSV's rows."""
+        if self.count(table) and not force: return 0
+        spec = TABLES[table]
+        df = load_csv_flex(path or spec["csv"], spec["cols"], spec["old_cols"], insert_index=3, fill_value="unknown")
+        if df is None or df.empty: return 0
+        import pandas as pd
+        for c in spec["cols"]:     # blank or garbled numbers become NULL instead of TEXT in an INTEGER column
+            if c not in TEXT_COLS: df[c] = pd.to_numeric(df[c], errors="coerce").astype("Int64")
+        self.append(table, df.astype(object).where(df.notna(), None).values.tolist(), replace=force)
+        return len(df)
+
+def _empty_frame(table):
+    import pandas as pd
+    return pd.DataFrame(columns=TABLES[table]["cols"], dtype=str)
+
+BACKENDS = {"csv": CsvStorage, "sqlite": SqliteStorage}
+_storage = None
+
+def get_storage():
+    global _storage
+    if _storage is None:
+        kind = os.environ.get("SLOPE_STORAGE", "csv")
+        if kind not in BACKENDS:
+            raise ValueError(f"SLOPE_STORAGE must be one of {sorted(BACKENDS)}, got {kind!r}")
+        _storage = BACKENDS[kind]()
+    return _storage
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if not args or args[0] != "import" or set(args[1:]) - {"--force"}:
+        sys.exit("usage: python -m mathgames.storage import [--force]\n"
+                 "  copies every game's CSVs into SQLite; tables that already have rows are skipped,\n"
+                 "  --force replaces their rows with the CSV's (stop the app first)")
+    # Through the registry's copy of this module (not __main__'s), which has every game's tables.
+    from mathgames.games import GAMES
+    from mathgames.storage import SqliteStorage, TABLES
+    db = SqliteStorage()
+    for game in GAMES.values():
+        for table in game.tables.values():
+            n = db.import_csv(table, force="--force" in args)
+            print(f"{game.id} {table}: imported {n} rows from {TABLES[table]['csv']} into {db.path}")
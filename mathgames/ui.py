@@ -0,0 +1,97 @@
+# Static markup for the Slope Showdown page (CSS, HUD, chips, tutorial canvas).
+# Built once at import, so a Streamlit rerun only sends the strings, it never rebuilds them.
+
+STATE_COLORS = {"Positive":"#22c55e","Negative":"#ef4444","Zero":"#3b82f6","Undefined":"#a855f7"}
+
+CSS = """
+<style>
+.big {font-size:2rem;font-weight:800;margin:.2rem 0;}
+.sub {color:#555;margin-bottom:.6rem;}
+.card {background:#fff;border:1px solid #eee;border-radius:18px;padding:1rem 1.2rem;box-shadow:0 1px 3px rgba(0,0,0,0.05);}
+.choice {padding:.75rem 1rem;border-radius:12px;border:1px solid #e5e7eb;margin:.35rem 0;font-weight:600;}
+.choice:hover {background:#f9fafb;border-color:#d1d5db;}
+.choice.selected {background:#e0f2fe;border-color:#bae6fd;}
+.choice.correct {background:#e8f5e9;border-color:#c8e6c9;}
+.choice.incorrect {background:#ffebee;border-color:#ffcdd2;}
+.hud {border-radius:16px; padding:.75rem 1rem; border:2px solid var(--hud-color); background:var(--hud-bg); display:flex; align-items:center; gap:14px; margin:.25rem 0 1rem 0;}
+.hud .score {font-size:2.2rem; font-weight:900; color:var(--hud-color); line-height:1;}
+.hud .label {font-weight:700; color:#111;}
+.hud .meta {margin-left:auto; color:#444; font-weight:600;}
+.badge {display:inline-block;padding:.3rem .6rem;border-radius:999px;color:#fff;font-weight:700;margin:.2rem .35rem 0 0;}
+.small {color:#666;font-size:.92rem}
+</style>
+"""
+
+def chip_html(text, ok=True):
+    bg = "#e8f5e9" if ok else "#ffebee"
+    bd = "#c8e6c9" if ok else "#ffcdd2"
+    fg = "#2e7d32" if ok else "#c62828"
+    return f"<div style='display:inline-block;background:{bg};border:1px solid {bd};color:{fg};padding:.25rem .55rem;border-radius:999px;font-size:.9rem;margin:.2rem 0'>{text}</div>"
+
+def hud_html(score, streak, best, i, total, min_score):
+    color  = "#22c55e" if score >= min_score else ("#2563eb" if score > 0 else ("#ef4444" if score < 0 else "#6b7280"))
+    bg     = "rgba(34,197,94,.08)" if score >= min_score else "rgba(37,99,235,.07)" if score>0 else "rgba(239,68,68,.07)" if score<0 else "rgba(107,114,128,.07)"
+    return f"""
+<div class="hud" style="--hud-color:{color}; --hud-bg:{bg}">
+  <div class="score">{score}</div>
+  <div class="label">points</div>
+  <div class="meta">Q {i}/{total} • Streak {streak} (best {best})</div>
+</div>
+"""
+
+# ---------------- Tutorial (with tolerant snapping + chips) ----------------
+TUTORIAL_INTRO = "<div class='sub'>Drag on the line to rotate it. Colors show: Positive (green), Negative (red), Zero (blue), Undefined (purple). Snaps within ±5° of horizontal/vertical.</div>"
+TUTORIAL_HTML = ("""
+    <div style="display:flex;flex-direction:column;align-items:flex-start">
+      <canvas id="c" width="560" height="420" style="border:1px solid #d9d9d9;border-radius:16px;background:#fff;box-shadow:0 1px 3px rgba(0,0,0,0.05)"></canvas>
+      <div id="label" style="margin-top:10px;font-family:system-ui,Segoe UI,Roboto,Arial;font-size:14px;"></div>
+      <div style="margin-top:6px">
+        <span class="badge" style="background:__POS__">Positive</span>
+        <span class="badge" style="background:__NEG__">Negative</span>
+        <span class="badge" style="background:__ZERO__">Zero</span>
+        <span class="badge" style="background:__UNDEF__">Undefined</span>
+      </div>
+    </div>
+    <script>
+      (function(){ function ready(fn){ if(document.readyState!='loading'){ fn(); } else { document.addEventListener('DOMContentLoaded', fn);}}
+        ready(function(){
+          const c=document.getElementById('c'); if(!c) return; const g=c.getContext('2d'); let a=Math.PI/8, drag=false;
+          const COLORS={Positive:'__POS__',Negative:'__NEG__',Zero:'__ZERO__',Undefined:'__UNDEF__'};
+          const EPS = Math.PI/36; // ~5 degrees snapping
+          function state(){
+            const absSin=Math.abs(Math.sin(a));
+            const absCos=Math.abs(Math.cos(a));
+            if (absCos < EPS) return ['Undefined', COLORS.Undefined];   // near vertical
+            if (absSin < EPS) return ['Zero', COLORS.Zero];             // near horizontal
+            return Math.tan(a) > 0 ? ['Positive', COLORS.Positive] : ['Negative', COLORS.Negative];
+          }
+          function draw(){
+            g.clearRect(0,0,c.width,c.height);
+            g.strokeStyle='rgba(0,0,0,0.10)'; g.lineWidth=1;
+            for(let x=0;x<=c.width;x+=70){g.beginPath();g.moveTo(x,0);g.lineTo(x,c.height);g.stroke();}
+            for(let y=0;y<=c.height;y+=70){g.beginPath();g.moveTo(0,y);g.lineTo(c.width,y);g.stroke();}
+            g.strokeStyle='#444'; g.lineWidth=1.2;
+            g.beginPath();g.moveTo(0,c.height/2);g.lineTo(c.width,c.height/2);g.stroke();
+            g.beginPath();g.moveTo(c.width/2,0);g.lineTo(c.width/2,c.height);g.stroke();
+            const [label,color]=state();
+            const cx=c.width/2, cy=c.height/2, dx=Math.cos(a), dy=Math.sin(a), L=Math.max(c.width,c.height);
+            g.strokeStyle=color; g.lineWidth=5;
+            g.beginPath(); g.moveTo(cx-dx*L, cy+dy*L); g.lineTo(cx+dx*L, cy-dy*L); g.stroke();
+            g.fillStyle=color; g.beginPath(); g.arc(cx+dx*120, cy-dy*120, 8, 0, Math.PI*2); g.fill();
+            const badge=document.getElementById('label');
+            if(badge){ const deg=((Math.round(a*180/Math.PI)%360)+360)%360;
+              badge.innerHTML='<span class="badge" style="background:'+color+'">Current: '+label+'</span>' +
+                              '<span style="color:#666;margin-left:10px">Angle '+deg+'°</span>'; }
+          }
+          function setAngle(e){ const r=c.getBoundingClientRect(); const mx=e.clientX-r.left, my=e.clientY-r.top; const cx=c.width/2, cy=c.height/2; a=Math.atan2(cy-my, mx-cx); }
+          c.addEventListener('mousedown',e=>{drag=true;setAngle(e);draw();});
+          c.addEventListener('mousemove',e=>{if(drag){setAngle(e);draw();}});
+          window.addEventListener('mouseup',()=>{drag=false;});
+          draw();
+        }); })();
+    </script>
+    """
+    .replace("__POS__", STATE_COLORS["Positive"])
+    .replace("__NEG__", STATE_COLORS["Negative"])
+    .replace("__ZERO__", STATE_COLORS["Zero"])
+    .replace("__UNDEF__", STATE_COLORS["Undefined"]))
@@ -0,0 +1,46 @@
+# Cold-start warm-up, once per server process, in a background thread: the first student after a
+# deploy or restart finds everything already loaded instead of waiting for it.
+# The hub (app.py) starts it on its first run; game pages start it too in case they are opened
+# directly (later calls are no-ops). Steps, in order:
+#   matplotlib  Agg canvas + one drawn figure (loads or builds the font cache); png backend only,
+#               svg and canvas are drawn without Matplotlib
+#   pandas      imported ahead of the Results stage, the only stage that needs it
+#   graphs      the default game's images (Slope Showdown's 78 lines, which Y-Intercept shares); the
+#               full set of every game is left to `python -m mathgames.games warm`, run offline, since
+#               with png it is ~90 s of Matplotlib in the serving process
+# Run: python -m mathgames.warmup [backend]   (the same steps in the foreground, with timings)
+
+import importlib, sys, threading, time
+from .graphs import GRAPHS, GRAPH_BACKEND, BACKEND_STYLES, render_png
+from .metrics import METRICS
+
+STEPS = {}                # step -> seconds, filled in as the warm-up runs
+_lock = threading.Lock()
+_thread = None
+
+def _step(name, fn, *args):
+    t0 = time.perf_counter()
+    with METRICS.span(f"warmup.{name}"): fn(*args)
+    STEPS[name] = round(time.perf_counter() - t0, 4)
+
+def warm_up(backend=GRAPH_BACKEND):
+    from .games import get_game
+    if BACKEND_STYLES[backend].startswith("png"): _step("matplotlib", render_png, "Zero", None, 0, None, 72)
+    _step("pandas", importlib.import_module, "pandas")
+    _step("graphs", GRAPHS.warm, get_game().keys(backend))
+    return STEPS
+
+def start(backend=GRAPH_BACKEND):
+    """Run warm_up in a daemon thread, once per process; returns the thread."""
+    global _thread
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(target=warm_up, args=(backend,), name="warmup", daemon=True)
+            _thread.start()
+        return _thread
+
+if __name__ == "__main__":
+    backend = sys.argv[1] if sys.argv[1:2] else GRAPH_BACKEND
+    if backend not in BACKEND_STYLES: sys.exit(f"usage: python -m mathgames.warmup [{'|'.join(BACKEND_STYLES)}]")
+    t0 = time.perf_counter(); warm_up(backend)
+    print(f"warm-up ({backend}) in {time.perf_counter() - t0:.3f}s: {STEPS} | graphs {GRAPHS.stats()}")
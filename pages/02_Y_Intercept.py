@@ -0,0 +1,11 @@
+# Y-Intercept – Read where the line crosses the y-axis
+# v5: the shared game page (mathgames/gamepage.py) driven by this game's entry in mathgames/games.py.
+# Run: streamlit run app.py
+
+import os, sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path: sys.path.insert(0, ROOT)
+from mathgames.gamepage import run
+
+run("y_intercept")